@@ -6,12 +6,19 @@ import random
 # "0" signifies a wall
 # "1" signifies no wall
 
-def generate_random_maze(rows, cols):
-    maze = [[random.choice(["0", "1"]) for j in range(cols)] for i in range(rows)]
-    agent_row = random.randint(0, rows - 1)
-    agent_col = random.randint(0, cols - 1)
-    goal_row = random.randint(0, rows - 1)
-    goal_col = random.randint(0, cols - 1)
+# seed - a seed or random.Random instance to generate the maze from (the global random module if None)
+def generate_random_maze(rows, cols, seed=None):
+    if seed is None:
+        rng = random
+    elif isinstance(seed, random.Random):
+        rng = seed
+    else:
+        rng = random.Random(seed)
+    maze = [[rng.choice(["0", "1"]) for j in range(cols)] for i in range(rows)]
+    agent_row = rng.randint(0, rows - 1)
+    agent_col = rng.randint(0, cols - 1)
+    goal_row = rng.randint(0, rows - 1)
+    goal_col = rng.randint(0, cols - 1)
     maze[agent_row][agent_col] = "A"
     maze[goal_row][goal_col] = "G"
     return maze, agent_row, agent_col, goal_row, goal_col
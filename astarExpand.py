@@ -1,5 +1,7 @@
 import random
 
+from main import a_star_search, entries_from_path
+
 # "A" signifies the agent
 # "G" signifies the goal
 # "0" signifies a wall
@@ -32,31 +34,39 @@ class MazeEntry:
 # rows, cols - dimensions of the maze
 # agent_row, agent_col - starting coordinates for the agent
 # goal_row, goal_col - coordinates for the goal
+# seed - a seed or random.Random instance to generate the maze from (the global random module if None)
 class Maze:
-    def __init__(self, rows, cols, wallProbability, agent_row=None, agent_col=None, goal_row=None, goal_col=None):
+    def __init__(self, rows, cols, wallProbability, agent_row=None, agent_col=None, goal_row=None, goal_col=None,
+                 seed=None):
+        if seed is None:
+            rng = random
+        elif isinstance(seed, random.Random):
+            rng = seed
+        else:
+            rng = random.Random(seed)
         self.content = {}
         self.rows = rows
         self.cols = cols
         if agent_row is None:
-            self.agent_row = random.randint(0, rows - 1)
+            self.agent_row = rng.randint(0, rows - 1)
         else:
             self.agent_row = agent_row
         if agent_col is None:
-            self.agent_col = random.randint(0, cols - 1)
+            self.agent_col = rng.randint(0, cols - 1)
         else:
             self.agent_col = agent_col
         if goal_row is None:
-            self.goal_row = random.randint(0, rows - 1)
+            self.goal_row = rng.randint(0, rows - 1)
         else:
             self.goal_row = goal_row
         if goal_col is None:
-            self.goal_col = random.randint(0, cols - 1)
+            self.goal_col = rng.randint(0, cols - 1)
         else:
             self.goal_col = goal_col
         for i in range(rows):
             for j in range(cols):
                 if (i != self.agent_row or j != self.agent_col) and (i != self.goal_row or j != self.goal_col):
-                    randomNumber = random.random()
+                    randomNumber = rng.random()
                     if randomNumber > wallProbability:
                         wallStatus = "1"
                     else:
@@ -72,6 +82,9 @@ class Maze:
                 row.append(self.content[(i, j)].status)
             print(row)
 
+    def get_status(self, row, col):
+        return self.content[(row, col)].status
+
 
 # Navigate through the maze
 def forward_a_star_walk(true_maze):
@@ -211,159 +224,19 @@ def update_adjacent_spaces(current_position, true_maze, known_maze):
 
 
 # Perform A* search on the known maze, beginning at initial_position, and targeting goal_position
+# with a_star_search from main.py, breaking ties first in first out,
+# and return the path as MazeEntry objects
 def forward_a_star(initial_position, goal_position, known_maze):
-    # create the initial node in the tree based on the initial_position
-    initial_node = MazeEntry(initial_position[0], initial_position[1], "1", 0, manhattan_distance_heuristic(initial_position, goal_position))
-
-    # initialize the queue with only the initial_node
-    q = [initial_node]
-
-    # initialize the list of expanded nodes (implemented using a dictionary)
-    expandedList = {}
-
-    expanded = 0
-
-    # Iterate as long as the queue is not empty
-    while q:
-        # Pop the first node off of the queue
-        x = q[0]
-        q.remove(x)
-
-        # If this node has already been expanded, continue to the next iteration
-        if expandedList.setdefault((x.row, x.col)) is not None:
-            continue
-
-        # Add this node to the expanded list
-        expandedList[(x.row, x.col)] = True
-        
-        expanded += 1
-
-        # If this node is the goal, return True, indicating success, as well as the path,
-        # Which is obtaining by following the parents of each node, up the tree
-        if x.row == goal_position[0] and x.col == goal_position[1]:
-            path = [x]
-            while x.parent is not None:
-                x = x.parent
-                path.append(x)
-            path.reverse()
-            # Passed - A Star Test (and thus findNeighbors is verified)
-            #print("Path From Forwards A Star:")
-            #for i in path:
-            #   i.print()
-            return True, path, expanded
-
-        # Find the neighbors of the current node, and for each neighbor, create a MazeEntry object to represent it,
-        # and add it to the queue in order of increasing cost + heuristic
-        for i in findNeighbors([x.row, x.col], known_maze):
-            if expandedList.setdefault((i.row, i.col)) is None:
-                i.parent = x
-                i.cost = x.cost + 1
-                i.heuristic = manhattan_distance_heuristic([i.row, i.col], goal_position)
-                q = addToQueue(q, i)
-
-    # If we exited from the while loop, meaning that the queue became empty without finding the goal,
-    # return false, indicating failure, and an empty list
-    return False, [], expanded
+    success, path, expanded = a_star_search(initial_position, goal_position, known_maze, favor_high_g=None)
+    return success, entries_from_path(path, known_maze.cols, MazeEntry), expanded
 
+# Perform A* search on the known maze, beginning at goal_position, and targeting initial_position
+# with a_star_search from main.py, breaking ties first in first out,
+# and return the path as MazeEntry objects
 def backwards_a_star(initial_position, goal_position, known_maze):
-    # create the initial node in the tree based on the initial_position
-    initial_node = MazeEntry(goal_position[0], goal_position[1], "1", 0,
-                             manhattan_distance_heuristic(goal_position, initial_position))
-
-    # initialize the queue with only the initial_node
-    q = [initial_node]
-
-    # initialize the list of expanded nodes (implemented using a dictionary)
-    expandedList = {}
-
-    expanded = 0
-
-    # Iterate as long as the queue is not empty
-    while q:
-        # Pop the first node off of the queue
-        x = q[0]
-        q.remove(x)
-
-        # If this node has already been expanded, continue to the next iteration
-        if expandedList.setdefault((x.row, x.col)) is not None:
-            continue
-
-        # Add this node to the expanded list
-        expandedList[(x.row, x.col)] = True
-        expanded += 1
-
-        # If this node is the goal, return True, indicating success, as well as the path,
-        # Which is obtaining by following the parents of each node, up the tree
-        if x.row == initial_position[0] and x.col == initial_position[1]:
-            path = [x]
-            while x.parent is not None:
-                x = x.parent
-                path.append(x)
-            path.reverse()
-            # Passed - A Star Test (and thus findNeighbors is verified)
-            #print("Path From Backwards A Star:")
-            #for i in path:
-            #   i.print()
-            return True, path, expanded
-
-        # Find the neighbors of the current node, and for each neighbor, create a MazeEntry object to represent it,
-        # and add it to the queue in order of increasing cost + heuristic
-        for i in findNeighbors([x.row, x.col], known_maze):
-            if expandedList.setdefault((i.row, i.col)) is None:
-                i.parent = x
-                i.cost = x.cost + 1
-                i.heuristic = manhattan_distance_heuristic([i.row, i.col], initial_position)
-                q = addToQueue(q, i)
-
-    # If we exited from the while loop, meaning that the queue became empty without finding the goal,
-    # return false, indicating failure, and an empty list
-    return False, [], expanded
-
-
-# Find all neighbors of a node based on its current position and the content of the known maze
-# Any neighbors which contain a wall are ignored
-def findNeighbors(current_position, known_maze):
-    neighbors = []
-    if current_position[0] != 0 and known_maze.content[(current_position[0] - 1, current_position[1])].status != "0":
-        neighbors.append(MazeEntry(current_position[0] - 1, current_position[1], "1"))
-    if current_position[0] != known_maze.rows - 1 and known_maze.content[(current_position[0] + 1, current_position[1])].status != "0":
-        neighbors.append(MazeEntry(current_position[0] + 1, current_position[1], "1"))
-    if current_position[1] != 0 and known_maze.content[(current_position[0], current_position[1] - 1)].status != "0":
-        neighbors.append(MazeEntry(current_position[0], current_position[1] - 1, "1"))
-    if current_position[1] != known_maze.cols - 1 and known_maze.content[(current_position[0], current_position[1] + 1)].status != "0":
-        neighbors.append(MazeEntry(current_position[0], current_position[1] + 1, "1"))
-    return neighbors
-
-
-# Compute the Manhattan distance heuristic for a node based on its position and the goal position
-def manhattan_distance_heuristic(current_position, goal_position):
-    if current_position[0] > goal_position[0]:
-        x_distance = current_position[0] - goal_position[0]
-    else:
-        x_distance = goal_position[0] - current_position[0]
-    if current_position[1] > goal_position[1]:
-        y_distance = current_position[1] - goal_position[1]
-    else:
-        y_distance = goal_position[1] - current_position[1]
-    return x_distance + y_distance
-
-
-# Add a new node to the queue in order of increasing cost + heuristic
-def addToQueue(q, node):
-    j = len(q)
-    q_new = []
-    for i in range(len(q)):
-        nodeValue = node.cost + node.heuristic
-        entryValue = q[i].cost + q[i].heuristic
-        if nodeValue < entryValue:
-            j = i
-            break
-    for i in range(0, j):
-        q_new.append(q[i])
-    q_new.append(node)
-    for i in range(j+1, len(q)+1):
-        q_new.append(q[i-1])
-    return q_new
+    success, path, expanded = a_star_search(initial_position, goal_position, known_maze, favor_high_g=None,
+                                            backward=True)
+    return success, entries_from_path(path, known_maze.cols, MazeEntry), expanded
 
 
 # PRINTS THE VISUAL PATH
@@ -401,6 +274,8 @@ def printPath(maze, path):
 rows = 15
 cols = 30
 wallProbability = 0.25
+# Maze x is generated from the seed str(master_seed) + ":" + str(x), so any maze can be regenerated on its own
+master_seed = 0
 
 #true_maze = Maze(rows, cols, wallProbability)
 #print("True Maze:")
@@ -417,29 +292,31 @@ wallProbability = 0.25
 #print("\n\nVISUALIZED PATH:")
 #printPath(path_maze, path)
 
-mazes = []
-paths = []
-
-successes = 0
-
-for x in range(0, 2):
-    true_maze = Maze(rows, cols, wallProbability)
-    print("\nMAZE " + str(x))
-    print("START: (" + str(true_maze.agent_row) + ", " + str(true_maze.agent_col) + ")")
-    print("GOAL: (" + str(true_maze.goal_row) + ", " + str(true_maze.goal_col) + ")\n")
-    fsuccess, fpath, fexpand = forward_a_star_walk(true_maze)
-    bsuccess, bpath, bexpand = backwards_a_star_walk(true_maze)
-    print("\n(Forward)\n")
-    printPath(true_maze, fpath)
-    #print("Total Expanded Nodes: " + str(fexpand) + "\n")
-    print("\n(Backward)\n")
-    printPath(true_maze, bpath)
-    #print("Total Expanded Nodes: " + str(bexpand) + "\n")
-    print("Forward Expanded Nodes: " + str(fexpand) + " // Backward Expanded Nodes: " + str(bexpand) + "\n--------")
-    #print("\n(Success: " + str(success) + ")\n\n--------")
-    #if (success):
-    #    successes += 1
-    mazes.append(true_maze)
-    paths.append(paths)
-
-print("\n\nSolved Mazes: " + str(successes))
+if __name__ == "__main__":
+    mazes = []
+    paths = []
+
+    successes = 0
+
+    for x in range(0, 2):
+        true_maze = Maze(rows, cols, wallProbability, seed=str(master_seed) + ":" + str(x))
+        print("\nMAZE " + str(x))
+        print("SEED: " + str(master_seed) + ":" + str(x))
+        print("START: (" + str(true_maze.agent_row) + ", " + str(true_maze.agent_col) + ")")
+        print("GOAL: (" + str(true_maze.goal_row) + ", " + str(true_maze.goal_col) + ")\n")
+        fsuccess, fpath, fexpand = forward_a_star_walk(true_maze)
+        bsuccess, bpath, bexpand = backwards_a_star_walk(true_maze)
+        print("\n(Forward)\n")
+        printPath(true_maze, fpath)
+        #print("Total Expanded Nodes: " + str(fexpand) + "\n")
+        print("\n(Backward)\n")
+        printPath(true_maze, bpath)
+        #print("Total Expanded Nodes: " + str(bexpand) + "\n")
+        print("Forward Expanded Nodes: " + str(fexpand) + " // Backward Expanded Nodes: " + str(bexpand) + "\n--------")
+        #print("\n(Success: " + str(success) + ")\n\n--------")
+        #if (success):
+        #    successes += 1
+        mazes.append(true_maze)
+        paths.append(paths)
+
+    print("\n\nSolved Mazes: " + str(successes))
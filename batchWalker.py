@@ -0,0 +1,30 @@
+from main import SearchWorkspace, forward_a_star_walk_favor_high_g_values, make_rng
+
+
+# Batch walker: routes many agents, each with its own start and goal, through one true maze.
+# The agents are walked one at a time and each has its own known maze, while everything which does not depend on the
+# agent is shared: the true maze itself, its neighbor table and a single SearchWorkspace used by every search.
+
+
+# Walk every agent through true_maze, and return one (success, path, expanded) per agent, as returned by the walk
+# agents - list of (start, goal) pairs, each a [row, col] position
+# walk - any walk from main.py, forward_a_star_walk_favor_high_g_values by default
+# Any keyword arguments are passed through to the walk. An agent whose start or goal is a wall fails without walking
+def walk_agents(true_maze, agents, walk=forward_a_star_walk_favor_high_g_values, **kwargs):
+    workspace = SearchWorkspace(true_maze.rows, true_maze.cols)
+    results = []
+    for start, goal in agents:
+        if true_maze.get_status(start[0], start[1]) == "0" or true_maze.get_status(goal[0], goal[1]) == "0":
+            results.append((False, [], 0))
+        else:
+            results.append(walk(true_maze, start=start, goal=goal, workspace=workspace, **kwargs))
+    return results
+
+
+# Return total_agents (start, goal) pairs of random spaces of true_maze which are not walls
+# seed - a seed or random.Random instance to choose the spaces from (the global random module if None)
+def random_agents(true_maze, total_agents, seed=None):
+    rng = make_rng(seed)
+    free = [[row, col] for row in range(true_maze.rows) for col in range(true_maze.cols)
+            if true_maze.get_status(row, col) != "0"]
+    return [(rng.choice(free), rng.choice(free)) for x in range(total_agents)]
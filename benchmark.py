@@ -0,0 +1,761 @@
+import contextlib, importlib.util, io, os, random, shutil, sys, tempfile, time, tracemalloc
+from collections import defaultdict
+
+import main
+import searchKernel
+from batchWalker import random_agents, walk_agents
+from dStarLite import d_star_lite_walk
+from hpaStar import hpa_star_walk
+from jumpPointSearch import jump_point_search
+from main import CompactMaze, KnownMaze, Maze, MazeEntry, SearchNode, SearchWorkspace, maze_seed, print_statistics
+from mazeFile import MazeFile, save_maze
+from numpyMaze import generate_numpy_maze, numpy
+from openLists import BinaryHeapQueue, BucketQueue, LinearQueue
+
+
+# Benchmarks for the searches in main.py
+# Run all benchmarks with "python benchmark.py", or a subset with e.g. "python benchmark.py open_lists"
+
+# Generate total_mazes mazes of the given size from per-maze seeds derived from master_seed
+def generate_mazes(rows, cols, wallProbability, total_mazes, master_seed=main.master_seed):
+    return [Maze(rows, cols, wallProbability, seed=maze_seed(master_seed, x)) for x in range(total_mazes)]
+
+
+# Run every walk over every maze, passing any keyword arguments through to the walk.
+# Return the total number of expanded cells and the total time taken
+def run_walks(mazes, **kwargs):
+    total_expand = 0
+    start_time = time.time()
+    for true_maze in mazes:
+        for name, walk in main.WALKS:
+            total_expand += walk(true_maze, **kwargs)[2]
+    return total_expand, time.time() - start_time
+
+
+# Print one line of benchmark results
+def print_result(name, total_expand, total_time):
+    print("  " + name + ": " + str(total_expand) + " expanded cells in " + str(round(total_time, 3)) + " seconds = " +
+          str(round(total_expand / total_time)) + " expansions per second")
+
+
+# Compare the original sorted-list open list with the binary heap on the same mazes
+def benchmark_open_lists():
+    for rows, cols, total_mazes in [(15, 30, 200), (101, 101, 10)]:
+        print("Open lists, " + str(total_mazes) + " mazes of " + str(rows) + "x" + str(cols) + ":")
+        mazes = generate_mazes(rows, cols, main.wallProbability, total_mazes)
+        for name, open_list in [("Sorted List", LinearQueue), ("Binary Heap", BinaryHeapQueue)]:
+            total_expand, total_time = run_walks(mazes, open_list=open_list)
+            print_result(name, total_expand, total_time)
+
+
+# Compare the binary heap with the bucketed open list on the 1000-maze batch used by main.py, and on larger mazes
+def benchmark_bucket_queue():
+    for rows, cols, total_mazes in [(15, 30, 1000), (101, 101, 20)]:
+        print("Heap vs buckets, " + str(total_mazes) + " mazes of " + str(rows) + "x" + str(cols) + ":")
+        mazes = generate_mazes(rows, cols, main.wallProbability, total_mazes)
+        for name, open_list in [("Binary Heap", BinaryHeapQueue), ("Buckets", BucketQueue)]:
+            total_expand, total_time = run_walks(mazes, open_list=open_list)
+            print_result(name, total_expand, total_time)
+
+
+# Compare the time taken to generate mazes with the per-space loop in Maze.__init__ and with NumPy
+def benchmark_generation():
+    generators = [("Maze", Maze), ("CompactMaze", CompactMaze)]
+    if numpy is None:
+        print("(NumPy is not installed, so generate_numpy_maze is skipped)")
+    else:
+        generators.append(("generate_numpy_maze", generate_numpy_maze))
+    for rows, cols, total_mazes in [(15, 30, 1000), (1000, 1000, 1)]:
+        print("Generation, " + str(total_mazes) + " mazes of " + str(rows) + "x" + str(cols) + ":")
+        for name, generator in generators:
+            start_time = time.time()
+            for x in range(total_mazes):
+                generator(rows, cols, main.wallProbability, seed=maze_seed(main.master_seed, x))
+            print("  " + name + ": " + str(round(time.time() - start_time, 3)) + " seconds")
+
+
+# Compare the expanded cells of Adaptive A* with those of Repeated Forward A* (favoring high g-values)
+def benchmark_adaptive():
+    for rows, cols, total_mazes in [(15, 30, 1000), (101, 101, 20)]:
+        print("Adaptive A*, " + str(total_mazes) + " mazes of " + str(rows) + "x" + str(cols) + ":")
+        mazes = generate_mazes(rows, cols, main.wallProbability, total_mazes)
+        forward_expand = 0
+        adaptive_expand = 0
+        for true_maze in mazes:
+            forward_expand += main.forward_a_star_walk_favor_high_g_values(true_maze)[2]
+            adaptive_expand += main.adaptive_a_star_walk(true_maze)[2]
+        print("  Forward Favoring High G Values: " + str(forward_expand) + " expanded cells")
+        print("  Adaptive: " + str(adaptive_expand) + " expanded cells (" +
+              str(round(100 * (forward_expand - adaptive_expand) / forward_expand, 2)) + "% fewer)")
+
+
+# Compare D* Lite with Repeated Forward A* (favoring high g-values), printing the same statistics as main.py
+def benchmark_d_star_lite():
+    walks = [main.WALKS[0], ("D* Lite", d_star_lite_walk)]
+    for rows, cols, total_mazes in [(15, 30, 1000), (101, 101, 20)]:
+        print("D* Lite, " + str(total_mazes) + " mazes of " + str(rows) + "x" + str(cols) + ":")
+        mazes = generate_mazes(rows, cols, main.wallProbability, total_mazes)
+        successes = 0
+        total_expands = [0] * len(walks)
+        total_times = [0] * len(walks)
+        for true_maze in mazes:
+            success = False
+            for i in range(len(walks)):
+                start_time = time.time()
+                result = walks[i][1](true_maze)
+                total_times[i] += time.time() - start_time
+                total_expands[i] += result[2]
+                success = success or result[0]
+            if success:
+                successes += 1
+        print_statistics(total_mazes, successes, total_expands, total_times, walks)
+        print()
+
+
+# Compare bidirectional A* with forward A*, with both tie-breaks, on the 1000-maze batch used by main.py and on
+# larger mazes: first as the initial plan of a walk, through a known maze without walls, and through the fully known
+# true maze, then as the initial search of the forward walks
+def benchmark_bidirectional():
+    searches = [("Forward, favoring high g-values", main.forward_a_star_favor_high_g_values),
+                ("Forward, favoring low g-values", main.forward_a_star_favor_low_g_values),
+                ("Bidirectional, favoring high g-values", main.bidirectional_a_star),
+                ("Bidirectional, favoring low g-values",
+                 lambda initial_position, goal_position, known_maze, open_list=BinaryHeapQueue, workspace=None:
+                 main.bidirectional_a_star(initial_position, goal_position, known_maze, open_list, workspace, False))]
+    for rows, cols, total_mazes in [(15, 30, 1000), (101, 101, 20)]:
+        mazes = generate_mazes(rows, cols, main.wallProbability, total_mazes)
+        workspace = SearchWorkspace(rows, cols)
+        for maze_name, known_maze in [("initial plan", lambda true_maze: KnownMaze(
+                true_maze.rows, true_maze.cols, true_maze.agent_row, true_maze.agent_col, true_maze.goal_row,
+                true_maze.goal_col)), ("fully known maze", lambda true_maze: true_maze)]:
+            print("Bidirectional A*, " + maze_name + ", " + str(total_mazes) + " mazes of " + str(rows) + "x" +
+                  str(cols) + ":")
+            known_mazes = [known_maze(true_maze) for true_maze in mazes]
+            for name, search in searches:
+                total_expand = 0
+                start_time = time.time()
+                for known in known_mazes:
+                    total_expand += search([known.agent_row, known.agent_col], [known.goal_row, known.goal_col],
+                                           known, workspace=workspace)[2]
+                print_result(name, total_expand, time.time() - start_time)
+        print("Bidirectional A*, walks, " + str(total_mazes) + " mazes of " + str(rows) + "x" + str(cols) + ":")
+        for name, search in [searches[0], searches[1]]:
+            for initial_name, initial_search in [("", None), (", bidirectional initial plan", searches[2][1])]:
+                total_expand = 0
+                start_time = time.time()
+                for true_maze in mazes:
+                    total_expand += main.a_star_walk(true_maze, search, initial_search=initial_search)[2]
+                print_result(name + initial_name, total_expand, time.time() - start_time)
+
+
+# Compare every walk with and without closed-form plans (see main.staircase_plan) on the 1000-maze batch used by
+# main.py and on larger mazes, counting no expansions for closed-form plans. Both must follow the same paths, so the
+# expansions counted with count_closed_form, as main.py does, are checked to be unchanged
+def benchmark_closed_form():
+    walks = [("Forward Favoring High G Values", main.forward_a_star_favor_high_g_values, False),
+             ("Forward Favoring Low G Values", main.forward_a_star_favor_low_g_values, False),
+             ("Backward", main.backwards_a_star, True),
+             ("Adaptive", main.adaptive_a_star, False)]
+    for rows, cols, total_mazes in [(15, 30, 1000), (101, 101, 20)]:
+        mazes = generate_mazes(rows, cols, main.wallProbability, total_mazes)
+        print("Closed-form plans, " + str(total_mazes) + " mazes of " + str(rows) + "x" + str(cols) + ":")
+        for name, search, backward in walks:
+            results = []
+            for closed_form, count_closed_form in [(False, True), (True, False), (True, True)]:
+                counters = {}
+                start_time = time.time()
+                results.append([main.a_star_walk(true_maze, search, backward=backward, counters=counters,
+                                                 closed_form=closed_form, count_closed_form=count_closed_form)[2]
+                                for true_maze in mazes])
+                total_time = time.time() - start_time
+                if count_closed_form and closed_form:
+                    continue
+                print_result(name + (", closed-form plans" if closed_form else ", searching"), sum(results[-1]),
+                             total_time)
+                if closed_form:
+                    print("    " + str(counters.get("closed_form_plans", 0)) + " closed-form plans out of " +
+                          str(total_mazes + counters.get("replans", 0)) + " plans")
+            if results[0] != results[2]:
+                print("  " + name + ": closed-form plans changed the expansions counted")
+
+
+# Compare HPA* with Repeated Forward A* (favoring high g-values) on mazes of increasing size, with each cluster size.
+# HPA* counts the spaces expanded while building its clusters as well as those expanded by its searches.
+# Its paths are near-optimal, so the length of each walk is reported too
+def benchmark_hpa_star():
+    walks = [main.WALKS[0]] + [("HPA*, clusters of " + str(cluster_size),
+                                lambda true_maze, cluster_size=cluster_size: hpa_star_walk(true_maze, cluster_size))
+                               for cluster_size in [10, 20]]
+    for rows, cols, total_mazes in [(101, 101, 20), (501, 501, 2), (1001, 1001, 2)]:
+        print("HPA*, " + str(total_mazes) + " mazes of " + str(rows) + "x" + str(cols) + ":")
+        mazes = [CompactMaze(rows, cols, main.wallProbability, seed=maze_seed(main.master_seed, x))
+                 for x in range(total_mazes)]
+        for name, walk in walks:
+            total_expand = 0
+            total_length = 0
+            start_time = time.time()
+            for true_maze in mazes:
+                success, path, expanded = walk(true_maze)
+                total_expand += expanded
+                total_length += len(path)
+            print_result(name, total_expand, time.time() - start_time)
+            print("    " + str(total_length) + " spaces walked")
+
+
+# Compare Jump Point Search with A* (favoring high g-values) across a range of wall probabilities,
+# both as a single search through a fully known maze and as the search used by the forward walk
+def benchmark_jump_point_search():
+    searches = [("A*", main.forward_a_star_favor_high_g_values), ("JPS", jump_point_search)]
+    for wallProbability in [0.0, 0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.35]:
+        print("Jump Point Search, wall probability " + str(wallProbability) + ":")
+        rows, cols, total_mazes = 301, 301, 10
+        print(" Single search, " + str(total_mazes) + " known mazes of " + str(rows) + "x" + str(cols) + ":")
+        mazes = [CompactMaze(rows, cols, wallProbability, seed=maze_seed(main.master_seed, x)) for x in range(total_mazes)]
+        for name, search in searches:
+            total_expand = 0
+            start_time = time.time()
+            for true_maze in mazes:
+                total_expand += search([true_maze.agent_row, true_maze.agent_col],
+                                       [true_maze.goal_row, true_maze.goal_col], true_maze)[2]
+            print_result(name, total_expand, time.time() - start_time)
+        rows, cols, total_mazes = 101, 101, 10
+        print(" Forward walk, " + str(total_mazes) + " mazes of " + str(rows) + "x" + str(cols) + ":")
+        mazes = generate_mazes(rows, cols, wallProbability, total_mazes)
+        for name, search in searches:
+            total_expand = 0
+            start_time = time.time()
+            for true_maze in mazes:
+                total_expand += main.forward_a_star_walk_favor_high_g_values(true_maze, search=search)[2]
+            print_result(name, total_expand, time.time() - start_time)
+
+
+# Compare replanning after every newly detected wall with lazy replanning, which only replans when a new wall
+# lies on the planned path. Both must solve exactly the same mazes
+def benchmark_lazy_replanning():
+    for rows, cols, total_mazes in [(15, 30, 1000), (101, 101, 20)]:
+        print("Lazy replanning, " + str(total_mazes) + " mazes of " + str(rows) + "x" + str(cols) + ":")
+        mazes = generate_mazes(rows, cols, main.wallProbability, total_mazes)
+        for name, walk in main.WALKS:
+            results = []
+            for lazy_replanning in [False, True]:
+                counters = {}
+                total_expand = 0
+                outcomes = []
+                start_time = time.time()
+                for true_maze in mazes:
+                    result = walk(true_maze, lazy_replanning=lazy_replanning, counters=counters)
+                    total_expand += result[2]
+                    outcomes.append(result[0])
+                results.append((total_expand, time.time() - start_time, counters, outcomes))
+            (eager_expand, eager_time, eager_counters, eager_outcomes), \
+                (lazy_expand, lazy_time, lazy_counters, lazy_outcomes) = results
+            print("  " + name + ":")
+            print("    Replanning on every new wall: " + str(eager_counters.get("replans", 0)) + " replans, " +
+                  str(eager_expand) + " expanded cells in " + str(round(eager_time, 3)) + " seconds")
+            print("    Lazy replanning: " + str(lazy_counters.get("replans", 0)) + " replans, " +
+                  str(lazy_counters.get("avoided_replans", 0)) + " avoided, " + str(lazy_expand) +
+                  " expanded cells (" + str(round(100 * (eager_expand - lazy_expand) / eager_expand, 2)) +
+                  "% fewer) in " + str(round(lazy_time, 3)) + " seconds")
+            print("    Same mazes solved: " + str(eager_outcomes == lazy_outcomes))
+
+
+# Return the neighbors of current_position which the searches in main.py add to the queue, using findNeighbors:
+# a SearchNode is created for every neighbor which does not contain a wall, then those already expanded are dropped
+def neighbors_from_find_neighbors(current_position, known_maze, expandedList, table):
+    return [i for i in main.findNeighbors(current_position, known_maze) if (i.row, i.col) not in expandedList]
+
+
+# The same, as the searches in main.py find them: by looking up the neighbor indices in the neighbor table (or with
+# bounds checks if table is None, see neighbor_indices) and only creating a SearchNode for those which do not contain a
+# wall and have not been expanded
+def neighbors_from_table(current_position, known_maze, expandedList, table):
+    cols = known_maze.cols
+    neighbors = []
+    index = current_position[0] * cols + current_position[1]
+    for neighbor in main.neighbor_indices(table, index, known_maze.rows * cols, cols):
+        if neighbor == -1:
+            continue
+        row, col = divmod(neighbor, cols)
+        if known_maze.get_status(row, col) != "0" and (row, col) not in expandedList:
+            neighbors.append(SearchNode(row, col))
+    return neighbors
+
+
+# Compare the cost per expansion of finding the neighbors to add to the queue with findNeighbors, with the
+# precomputed neighbor table and with the bounds checks used instead for mazes too large for a table, where the space
+# above each expanded space has already been expanded, as its parent typically has. Then report the cost per
+# expansion of the searches, which use the neighbor table.
+# Each timing is the best of several runs, since single runs of a microbenchmark are noisy
+def benchmark_neighbor_table():
+    rows, cols = 101, 101
+    finders = [("findNeighbors", neighbors_from_find_neighbors, None),
+               ("Neighbor table", neighbors_from_table, main.neighbor_table(rows, cols)),
+               ("Bounds checks", neighbors_from_table, None)]
+    positions = [[row, col] for row in range(rows) for col in range(cols)]
+    expanded = [{(row - 1, col): True} for row, col in positions]
+    for maze_type in [Maze, CompactMaze]:
+        mazes = [maze_type(rows, cols, main.wallProbability, seed=maze_seed(main.master_seed, x)) for x in range(10)]
+        print("Neighbors of every space of 10 mazes of 101x101, " + maze_type.__name__ + ":")
+        for name, finder, table in finders:
+            best_time = None
+            for repeat in range(5):
+                start_time = time.time()
+                for known_maze in mazes:
+                    for i in range(len(positions)):
+                        finder(positions[i], known_maze, expanded[i], table)
+                total_time = time.time() - start_time
+                if best_time is None or total_time < best_time:
+                    best_time = total_time
+            print("  " + name + ": " + str(round(1e9 * best_time / (len(mazes) * len(positions)))) +
+                  " ns per expansion")
+        best_time = None
+        for repeat in range(5):
+            total_expand = 0
+            start_time = time.time()
+            for known_maze in mazes:
+                total_expand += main.forward_a_star_favor_high_g_values([known_maze.agent_row, known_maze.agent_col],
+                                                                        [known_maze.goal_row, known_maze.goal_col],
+                                                                        known_maze)[2]
+            total_time = time.time() - start_time
+            if best_time is None or total_time < best_time:
+                best_time = total_time
+        print("  A* (favoring high g-values) through the same, fully known, mazes: " + str(total_expand) +
+              " expanded cells, " + str(round(1e9 * best_time / total_expand)) + " ns per expansion")
+
+
+# DictSearchWorkspace Class - a SearchWorkspace which allocates new dictionaries and a new parents array for every
+# search, like the searches did before SearchWorkspace. Kept as a reference for benchmark_workspace
+class DictSearchWorkspace(main.SearchWorkspace):
+    def start_search(self):
+        self.closed = defaultdict(int)
+        self.generated = defaultdict(int)
+        self.g = {}
+        self.parents = main.new_parents(self)
+        self.search_id = 1
+        return self.search_id
+
+
+# Compare allocating the closed list and parents of every search with reusing one SearchWorkspace per walk,
+# on the 1000-maze batch used by main.py and on larger mazes.
+# Then measure the memory allocated by one search through a large maze, with a new and with a reused workspace
+def benchmark_workspace():
+    search_workspace = main.SearchWorkspace
+    for rows, cols, total_mazes in [(15, 30, 1000), (101, 101, 20)]:
+        print("Search workspaces, " + str(total_mazes) + " mazes of " + str(rows) + "x" + str(cols) + ":")
+        mazes = generate_mazes(rows, cols, main.wallProbability, total_mazes)
+        try:
+            for name, workspace_type in [("Allocated per search", DictSearchWorkspace),
+                                         ("SearchWorkspace", search_workspace)]:
+                main.SearchWorkspace = workspace_type
+                total_expand, total_time = run_walks(mazes)
+                print_result(name, total_expand, total_time)
+        finally:
+            main.SearchWorkspace = search_workspace
+
+    rows, cols = 1001, 1001
+    known_maze = CompactMaze(rows, cols, main.wallProbability, 0, 0, 0, 10, seed=maze_seed(main.master_seed, 0))
+    print("Memory allocated by one search of a " + str(rows) + "x" + str(cols) + " maze:")
+    # The arrays of a workspace are allocated by its first search, so the reused workspace has searched once already
+    workspace = search_workspace(rows, cols)
+    workspace.start_search()
+    for name, make_workspace in [("New workspace", lambda: search_workspace(rows, cols)),
+                                 ("Reused workspace", lambda: workspace)]:
+        tracemalloc.start()
+        expanded = main.forward_a_star_favor_high_g_values([0, 0], [0, 10], known_maze, workspace=make_workspace())[2]
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("  " + name + ": " + str(expanded) + " expanded cells, " + str(round(peak / 1e3, 1)) + " kB")
+
+
+# Compare walking many agents through one true maze one walk at a time with walk_agents, which shares one
+# workspace between all of them, reporting the throughput in agents per second
+def benchmark_batch():
+    for rows, cols, total_agents in [(15, 30, 1000), (101, 101, 100)]:
+        true_maze = generate_mazes(rows, cols, main.wallProbability, 1)[0]
+        agents = random_agents(true_maze, total_agents, seed=maze_seed(main.master_seed, 0))
+        print("Batch walks, " + str(total_agents) + " agents through one maze of " + str(rows) + "x" + str(cols) + ":")
+        for walk_name, walk in main.WALKS:
+            start_time = time.time()
+            for start, goal in agents:
+                walk(true_maze, start=start, goal=goal)
+            single_time = time.time() - start_time
+            start_time = time.time()
+            results = walk_agents(true_maze, agents, walk)
+            batch_time = time.time() - start_time
+            print("  " + walk_name + ": " + str(sum(result[0] for result in results)) + " agents reached their goals")
+            print("    One at a time: " + str(round(total_agents / single_time)) + " agents per second")
+            print("    walk_agents: " + str(round(total_agents / batch_time)) + " agents per second")
+
+
+# Compare walking through mazes generated in memory with walking through the same mazes saved to maze files,
+# with 1 byte and with 1 bit per space, then compare generating a large maze with opening it from a maze file
+def benchmark_maze_file():
+    directory = tempfile.mkdtemp()
+    try:
+        rows, cols, total_mazes = 101, 101, 20
+        print("Maze files, " + str(total_mazes) + " mazes of " + str(rows) + "x" + str(cols) + ":")
+        mazes = generate_mazes(rows, cols, main.wallProbability, total_mazes)
+        for name, packed in [("Maze", None), ("Maze file, 1 byte per space", False),
+                             ("Maze file, 1 bit per space", True)]:
+            if packed is None:
+                total_expand, total_time = run_walks(mazes)
+            else:
+                maze_files = []
+                for x, maze in enumerate(mazes):
+                    path = os.path.join(directory, str(x) + ".maze")
+                    save_maze(maze, path, maze_seed(main.master_seed, x), packed)
+                    maze_files.append(MazeFile(path))
+                total_expand, total_time = run_walks([maze_file.maze for maze_file in maze_files])
+                for maze_file in maze_files:
+                    maze_file.close()
+            print_result(name, total_expand, total_time)
+
+        rows, cols = 1001, 1001
+        print("Maze files, one maze of " + str(rows) + "x" + str(cols) + ":")
+        start_time = time.time()
+        maze = CompactMaze(rows, cols, main.wallProbability, seed=maze_seed(main.master_seed, 0))
+        print("  Generating a CompactMaze: " + str(round(time.time() - start_time, 3)) + " seconds")
+        # Build the neighbor table first, so that both walks below find it cached
+        main.neighbor_table(rows, cols)
+        for name, packed in [("1 byte per space", False), ("1 bit per space", True)]:
+            path = os.path.join(directory, name + ".maze")
+            save_maze(maze, path, maze_seed(main.master_seed, 0), packed)
+            start_time = time.time()
+            with MazeFile(path) as maze_file:
+                open_time = time.time() - start_time
+                success = main.forward_a_star_walk_favor_high_g_values(maze_file.maze)[0]
+                walk_time = time.time() - start_time - open_time
+            print("  Maze file, " + name + ": " + str(round(os.path.getsize(path) / 1e6, 3)) + " MB, opened in " +
+                  str(round(open_time * 1e3, 3)) + " ms, walked in " + str(round(walk_time, 3)) + " seconds" +
+                  (" (success)" if success else " (failure)"))
+    finally:
+        shutil.rmtree(directory)
+
+
+# The original printPath, returning the rendered grid instead of printing it: each row is built by string
+# concatenation, and then rebuilt by slicing for every space on the path
+def concatenated_render_path(maze, path):
+    row = []
+    for i in range(maze.rows):
+        strRow = ""
+        for j in range(maze.cols):
+            status = maze.get_status(i, j)
+            if (status == "1"):
+                strRow += "\u2591"
+            if (status == "0"):
+                strRow += "\u2588"
+            if (status == "A"):
+                strRow += "A"
+            if (status == "G"):
+                strRow += "G"
+        row.append(strRow)
+
+    xCoords = []
+    yCoords = []
+    for node in path[1:-1]:
+        temp = node.get()
+        x, y = map(int, temp.split(","))
+        xCoords.append(x)
+        yCoords.append(y)
+
+    for index, x in enumerate(xCoords):
+        row[x] = row[x][:yCoords[index]] + "\u2592" + row[x][yCoords[index] + 1:]
+
+    return "\n".join(row)
+
+
+# Compare the original printPath with render_path, rendering the path of every walk on the 1000-maze batch used by
+# main.py, and a path through a large maze in each kind of maze and with each set of glyphs
+def benchmark_render():
+    mazes = generate_mazes(main.rows, main.cols, main.wallProbability, 1000)
+    paths = [(true_maze, walk(true_maze)[1]) for true_maze in mazes for name, walk in main.WALKS]
+    print("Rendering, the paths of every walk through 1000 mazes of " + str(main.rows) + "x" + str(main.cols) + ":")
+    for name, render in [("Concatenation", concatenated_render_path), ("render_path", main.render_path)]:
+        start_time = time.time()
+        for true_maze, path in paths:
+            render(true_maze, path)
+        print("  " + name + ": " + str(round(time.time() - start_time, 3)) + " seconds")
+
+    rows, cols = 1000, 1000
+    print("Rendering, a path of " + str(rows + cols - 1) + " spaces through one maze of " + str(rows) + "x" +
+          str(cols) + ":")
+    path = [MazeEntry(row, 0, "0") for row in range(rows)] + [MazeEntry(rows - 1, col, "0") for col in range(1, cols)]
+    for maze_type in [Maze, CompactMaze]:
+        true_maze = maze_type(rows, cols, main.wallProbability, 0, 0, rows - 1, cols - 1,
+                              seed=maze_seed(main.master_seed, 0))
+        renders = [("Concatenation", concatenated_render_path, None)]
+        for glyphs_name in ["BLOCK_GLYPHS", "DIGIT_GLYPHS", "ASCII_GLYPHS"]:
+            renders.append(("render_path, " + glyphs_name, main.render_path, getattr(main, glyphs_name)))
+        for name, render, glyphs in renders:
+            start_time = time.time()
+            if glyphs is None:
+                render(true_maze, path)
+            else:
+                render(true_maze, path, glyphs)
+            print("  " + maze_type.__name__ + ", " + name + ": " + str(round((time.time() - start_time) * 1e3, 1)) +
+                  " ms")
+
+
+# Return searchKernel.py loaded from its source, as a separate module, even if the compiled kernel has been built
+def interpreted_search_kernel():
+    path = os.path.join(os.path.dirname(searchKernel.__file__), "searchKernel.py")
+    spec = importlib.util.spec_from_file_location("interpretedSearchKernel", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Compare the generic loop of a_star_search with the search kernel, both interpreted and, if it has been built,
+# compiled, reporting the throughput of every walk in mazes per second on the 1000-maze batch used by main.py and on
+# larger mazes. Each throughput is the best of 3 runs. Every walk must follow the same path and expand the same
+# number of cells whichever runs the searches.
+# Measured with Python 3.11 on one core (mypyc 2.4, Cython 3.3), in mazes per second, 15x30 / 101x101:
+#                              Forward, high g    Forward, low g
+#   Generic loop                  1444 /  98        1089 / 19.6
+#   Kernel, interpreted           2141 / 166        1252 / 27.2
+#   Kernel, mypyc                 3009 / 206        1668 / 34.2
+#   Kernel, Cython                2513 / 221        1882 / 32.7
+# Both compiled kernels followed the same paths and expanded the same cells as the generic loop
+def benchmark_search_kernel():
+    print("Search kernel: " + ("compiled, " if main.SEARCH_KERNEL_COMPILED else "not compiled, ") + searchKernel.__file__)
+    kernels = [("Generic loop", None), ("Kernel, interpreted", interpreted_search_kernel())]
+    if main.SEARCH_KERNEL_COMPILED:
+        kernels.append(("Kernel, compiled", searchKernel))
+    for rows, cols, total_mazes in [(15, 30, 1000), (101, 101, 20)]:
+        mazes = generate_mazes(rows, cols, main.wallProbability, total_mazes)
+        print("Search kernel, " + str(total_mazes) + " mazes of " + str(rows) + "x" + str(cols) + ":")
+        for walk_name, walk in main.WALKS:
+            results = []
+            for name, kernel in kernels:
+                main.search_kernel = kernel
+                best_time = None
+                for run in range(3):
+                    start_time = time.time()
+                    walked = [walk(true_maze) for true_maze in mazes]
+                    total_time = time.time() - start_time
+                    if best_time is None or total_time < best_time:
+                        best_time = total_time
+                results.append([(success, [(entry.row, entry.col) for entry in path], expanded)
+                                for success, path, expanded in walked])
+                print("  " + walk_name + ", " + name + ": " + str(sum(result[2] for result in results[-1])) +
+                      " expanded cells, " + str(round(total_mazes / best_time, 1)) + " mazes per second")
+            for (name, kernel), result in zip(kernels[1:], results[1:]):
+                if result != results[0]:
+                    print("  " + walk_name + ", " + name + ": different paths or expanded cells than the generic loop")
+    main.search_kernel = searchKernel
+
+
+# Return the number of bytes allocated per object by make_node, measured with tracemalloc
+def bytes_per_node(make_node):
+    tracemalloc.start()
+    nodes = [make_node(x) for x in range(10000)]
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del nodes
+    return (allocated - 10000 * 8) / 10000
+
+
+# Profile the search node allocations of the 1000-maze batch used by main.py, comparing the bytes the searches
+# allocate for their nodes when every node is a SearchNode with what they allocated when every node was a MazeEntry.
+# The search kernel creates no nodes at all, so the searches run the generic loop of a_star_search instead
+def benchmark_allocations():
+    mazes = generate_mazes(15, 30, main.wallProbability, 1000)
+    entry_bytes = bytes_per_node(lambda x: MazeEntry(1, 2, "1", 3, 4))
+    node_bytes = bytes_per_node(lambda x: SearchNode(1, 2, 3, 4))
+
+    # Count the nodes created by the searches, by replacing SearchNode in main.py with a subclass which counts them
+    created = [0]
+    search_node = main.SearchNode
+
+    class CountingSearchNode(search_node):
+        __slots__ = ()
+
+        def __init__(self, *args):
+            created[0] += 1
+            super().__init__(*args)
+
+    main.SearchNode = CountingSearchNode
+    search_kernel = main.search_kernel
+    main.search_kernel = None
+    tracemalloc.start()
+    try:
+        run_walks(mazes)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        main.SearchNode = search_node
+        main.search_kernel = search_kernel
+
+    print("Search node allocations, 1000 mazes of 15x30:")
+    print("  Nodes created: " + str(created[0]))
+    print("  MazeEntry: " + str(round(entry_bytes)) + " bytes per node = " +
+          str(round(created[0] * entry_bytes / 1e6, 2)) + " MB allocated")
+    print("  SearchNode: " + str(round(node_bytes)) + " bytes per node = " +
+          str(round(created[0] * node_bytes / 1e6, 2)) + " MB allocated")
+    print("  Peak traced memory while running the walks: " + str(round(peak / 1e6, 2)) + " MB")
+
+
+# Expanded cells of every walk in main.WALKS on seeded mazes, recorded before the four searches and walks in main.py
+# were merged into a_star_search and a_star_walk, which must leave them unchanged.
+# (rows, cols, total_mazes, lazy_replanning) -> for each walk, (total expanded cells,
+# sum over every maze number x of (x + 1) * the expanded cells of maze x)
+REGRESSION_EXPANSIONS = {(15, 30, 1000, True): [(100101, 48241195), (264697, 128854752), (99121, 48369331),
+                                                (97682, 47307907)],
+                         (15, 30, 1000, False): [(165309, 80298603), (418338, 203775946), (164287, 80560377),
+                                                 (160821, 78508575)],
+                         (101, 101, 20, True): [(22757, 224841), (304547, 2857719), (23800, 258975), (22689, 225012)],
+                         (101, 101, 20, False): [(44726, 456350), (590751, 5706438), (45290, 486379),
+                                                 (44360, 455045)]}
+
+
+# Check that bidirectional_a_star finds a path exactly when a_star_search does, and a path of the same length, both
+# with each tie-break through small fully known mazes between random spaces, and as the initial search of walks.
+# Starts with corridors, where either search can reach the root of the other before it has been expanded.
+# Return the number of failures
+def bidirectional_failures(total_mazes=1500):
+    failures = 0
+    cases = [([0, 0], [0, 3], KnownMaze(1, 16, 0, 0, 0, 3)), ([0, 0], [4, 0], KnownMaze(5, 1, 0, 0, 4, 0)),
+             ([4, 0], [0, 0], KnownMaze(5, 1, 4, 0, 0, 0)), ([0, 2], [0, 2], KnownMaze(1, 5, 0, 2, 0, 2))]
+    for x in range(total_mazes):
+        rng = random.Random(maze_seed(main.master_seed, x))
+        rows = rng.randint(1, 8)
+        cols = rng.randint(1, 8)
+        known_maze = CompactMaze(rows, cols, rng.choice([0.1, 0.25, 0.4]), seed=rng)
+        for trial in range(4):
+            start = [rng.randrange(rows), rng.randrange(cols)]
+            goal = [rng.randrange(rows), rng.randrange(cols)]
+            if known_maze.get_status(start[0], start[1]) != "0" and known_maze.get_status(goal[0], goal[1]) != "0":
+                cases.append((start, goal, known_maze))
+    for start, goal, known_maze in cases:
+        for favor_high_g in [True, False]:
+            success, path, expanded = main.a_star_search(start, goal, known_maze, favor_high_g=favor_high_g)
+            result = main.bidirectional_a_star(start, goal, known_maze, favor_high_g=favor_high_g)
+            if result[0] != success or len(result[1]) != len(path):
+                failures += 1
+                print("  FAILED bidirectional_a_star from " + str(start) + " to " + str(goal) + " in a " +
+                      str(known_maze.rows) + "x" + str(known_maze.cols) + " maze: " + str(result[0]) + ", " +
+                      str(len(result[1])) + " spaces instead of " + str(success) + ", " + str(len(path)))
+    for x in range(total_mazes):
+        true_maze = Maze(6, 9, main.wallProbability, seed=maze_seed(main.master_seed, x))
+        expected = main.forward_a_star_walk_favor_high_g_values(true_maze)[0]
+        if main.a_star_walk(true_maze, main.forward_a_star_favor_high_g_values,
+                            initial_search=main.bidirectional_a_star)[0] != expected:
+            failures += 1
+            print("  FAILED walk with a bidirectional initial plan through maze " + str(x))
+    return failures
+
+
+# Results of the walks of the standalone scripts, which search with a_star_search, on the first 300 seeded mazes of the
+# size each script walks, recorded while every script still had its own copy of the search.
+# The one exception is the backward walk of backwardsAstar.py: its search used to return None when it found no path,
+# so the walk kept following its previous plan through the new wall, and it now fails there instead.
+# script -> (rows, cols, {walk: (successes, total expanded cells, sum over every maze number x of (x + 1) * the
+# expanded cells of maze x, sum over every maze number x of (x + 1) * the sum over every step i of the path of
+# (i + 1) * (row * cols + col))}), with no expanded cells for the walks which do not count them
+SCRIPT_REGRESSION = {
+    "repeatedForwardAStarFavorHighGValue": (15, 30, {"forward_a_star_walk": (286, 9581, 1368876, 4284100082)}),
+    "repeatedForwardAStarFavorLowGValue": (15, 30, {"forward_a_star_walk": (286, 24174, 3392779, 4284100082)}),
+    "astarExpand": (15, 30, {"forward_a_star_walk": (286, 24174, 3392779, 4284100082),
+                             "backwards_a_star_walk": (286, 21680, 3155323, 4315924767)}),
+    "astarPath": (15, 35, {"walk": (285, 0, 0, 7092688723)}),
+    "backwardsAstar": (15, 35, {"forward_a_star_walk": (285, 0, 0, 7092688723),
+                                "backwards_a_star_walk": (285, 0, 0, 7618400163)}),
+    "mainUpdated": (15, 30, {"forward_a_star_walk_favor_high_g_values": (286, 9581, 1368876, 4284100082),
+                             "forward_a_star_walk_favor_low_g_values": (286, 24174, 3392779, 4284100082),
+                             "backwards_a_star_walk": (286, 7034, 1119472, 4315924767),
+                             "adaptive_a_star_walk": (286, 9581, 1368876, 4284100082)}),
+    "pathIterationPrinting": (15, 30, {"forward_a_star_walk_favor_high_g_values": (286, 9581, 1368876, 4284100082),
+                                       "forward_a_star_walk_favor_low_g_values": (286, 24174, 3392779, 4284100082),
+                                       "backwards_a_star_walk": (286, 7034, 1119472, 4315924767),
+                                       "adaptive_a_star_walk": (286, 9581, 1368876, 4284100082)})}
+
+
+# Check the walks of the standalone scripts against SCRIPT_REGRESSION, discarding whatever they print.
+# Return the number of failures
+def script_failures(total_mazes=300):
+    failures = 0
+    for module_name, (rows, cols, expected) in SCRIPT_REGRESSION.items():
+        script = importlib.import_module(module_name)
+        # The walks of the scripts read the size of the maze from the scripts' globals
+        script.rows, script.cols = rows, cols
+        for walk_name, recorded in expected.items():
+            successes = 0
+            expanded = []
+            path_checksum = 0
+            with contextlib.redirect_stdout(io.StringIO()):
+                for x in range(total_mazes):
+                    true_maze = script.Maze(rows, cols, main.wallProbability, seed=maze_seed(main.master_seed, x))
+                    result = getattr(script, walk_name)(true_maze)
+                    successes += result[0]
+                    expanded.append(result[2] if len(result) > 2 else 0)
+                    path_checksum += (x + 1) * sum((i + 1) * (entry.row * cols + entry.col)
+                                                   for i, entry in enumerate(result[1]))
+            result = (successes, sum(expanded), sum((x + 1) * cells for x, cells in enumerate(expanded)), path_checksum)
+            if result != recorded:
+                failures += 1
+                print("  FAILED " + module_name + "." + walk_name + ": " + str(result) + " instead of " + str(recorded))
+    return failures
+
+
+# Check that every walk still expands the recorded number of cells on the mazes of REGRESSION_EXPANSIONS,
+# with every open list except the (slow) sorted list, and with both Maze and CompactMaze.
+# Then check the walks of the standalone scripts (see script_failures), and bidirectional_a_star against
+# a_star_search (see bidirectional_failures).
+# Exits with status 1 if any count differs, so that the check can fail a build
+def benchmark_regression():
+    failures = 0
+    for (rows, cols, total_mazes, lazy_replanning), expected in REGRESSION_EXPANSIONS.items():
+        previous_failures = failures
+        print("Regression, " + str(total_mazes) + " mazes of " + str(rows) + "x" + str(cols) +
+              (", lazy replanning:" if lazy_replanning else ", eager replanning:"))
+        for maze_type in [Maze, CompactMaze]:
+            mazes = [maze_type(rows, cols, main.wallProbability, seed=maze_seed(main.master_seed, x))
+                     for x in range(total_mazes)]
+            for open_list in [BinaryHeapQueue, BucketQueue]:
+                for (name, walk), (total, checksum) in zip(main.WALKS, expected):
+                    expanded = [walk(true_maze, open_list=open_list, lazy_replanning=lazy_replanning)[2]
+                                for true_maze in mazes]
+                    result = (sum(expanded), sum((x + 1) * cells for x, cells in enumerate(expanded)))
+                    if result != (total, checksum):
+                        failures += 1
+                        print("  FAILED " + maze_type.__name__ + ", " + open_list.__name__ + ", " + name + ": " +
+                              str(result) + " instead of " + str((total, checksum)))
+        if failures == previous_failures:
+            print("  unchanged")
+    print("Regression, standalone scripts:")
+    previous_failures = failures
+    failures += script_failures()
+    if failures == previous_failures:
+        print("  unchanged")
+    print("Regression, bidirectional A*:")
+    previous_failures = failures
+    failures += bidirectional_failures()
+    if failures == previous_failures:
+        print("  same successes and path lengths as A*")
+    print("Regression: " + ("all expansion counts unchanged" if failures == 0 else str(failures) + " failures"))
+    if failures:
+        sys.exit(1)
+
+
+BENCHMARKS = {"open_lists": benchmark_open_lists,
+              "bucket_queue": benchmark_bucket_queue,
+              "generation": benchmark_generation,
+              "adaptive": benchmark_adaptive,
+              "d_star_lite": benchmark_d_star_lite,
+              "bidirectional": benchmark_bidirectional,
+              "closed_form": benchmark_closed_form,
+              "hpa_star": benchmark_hpa_star,
+              "jump_point_search": benchmark_jump_point_search,
+              "allocations": benchmark_allocations,
+              "lazy_replanning": benchmark_lazy_replanning,
+              "neighbor_table": benchmark_neighbor_table,
+              "workspace": benchmark_workspace,
+              "batch": benchmark_batch,
+              "maze_file": benchmark_maze_file,
+              "render": benchmark_render,
+              "search_kernel": benchmark_search_kernel,
+              "regression": benchmark_regression}
+
+if __name__ == "__main__":
+    for benchmark_name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[benchmark_name]()
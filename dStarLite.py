@@ -0,0 +1,171 @@
+import heapq
+
+from main import KnownMaze, MazeEntry, manhattan_distance_heuristic, neighbor_indices, neighbor_table, \
+    update_adjacent_spaces
+
+INFINITY = float("inf")
+
+
+# DStarLite Class - incremental planner (D* Lite) for a single walk through the known maze
+# Unlike the A* walks in main.py, which search from scratch after every newly detected wall,
+# D* Lite keeps its search tree between searches and only repairs the part of it affected by new walls.
+# It searches backward from the goal, so g-values are distances to the goal and the agent can move freely.
+# known_maze - the maze as the agent knows it
+# table - the neighbor_table of the known maze (None for large mazes, see neighbor_indices)
+# size - the number of spaces of the known maze
+# goal_position - [row, col] of the goal
+# g, rhs - distance to the goal and one-step lookahead distance for every space, at index row * cols + col
+# U - the priority queue of inconsistent spaces, as a heap of (key, index) entries
+# keys - the current key of every space in U; heap entries whose key differs are stale and skipped
+# km - the key modifier, which grows as the agent moves so that keys already in U stay valid
+# last_position - the position of the agent when km was last updated
+# expanded - the number of spaces expanded so far
+class DStarLite:
+    def __init__(self, known_maze, start_position, goal_position):
+        self.known_maze = known_maze
+        self.table = neighbor_table(known_maze.rows, known_maze.cols)
+        self.size = known_maze.rows * known_maze.cols
+        self.start_position = list(start_position)
+        self.goal_position = list(goal_position)
+        self.g = [INFINITY] * (known_maze.rows * known_maze.cols)
+        self.rhs = [INFINITY] * (known_maze.rows * known_maze.cols)
+        self.U = []
+        self.keys = {}
+        self.km = 0
+        self.last_position = list(start_position)
+        self.expanded = 0
+        goal = self.index(goal_position)
+        self.rhs[goal] = 0
+        self.push(goal)
+
+    def index(self, position):
+        return position[0] * self.known_maze.cols + position[1]
+
+    def position(self, index):
+        return [index // self.known_maze.cols, index % self.known_maze.cols]
+
+    # Return the neighbors of a space which can be moved between, i.e. which are not known to contain a wall.
+    # A known wall has no neighbors at all, since every edge into or out of it has infinite cost
+    def neighbors(self, index):
+        known_maze = self.known_maze
+        if known_maze.get_status_at(index) == "0":
+            return []
+        neighbors = []
+        for neighbor in neighbor_indices(self.table, index, self.size, known_maze.cols):
+            if neighbor == -1:
+                continue
+            if known_maze.get_status_at(neighbor) != "0":
+                neighbors.append(neighbor)
+        return neighbors
+
+    def calculate_key(self, index):
+        m = min(self.g[index], self.rhs[index])
+        return (m + manhattan_distance_heuristic(self.start_position, self.position(index)) + self.km, m)
+
+    def push(self, index):
+        key = self.calculate_key(index)
+        self.keys[index] = key
+        heapq.heappush(self.U, (key, index))
+
+    # Return the smallest key in U, discarding stale heap entries
+    def top_key(self):
+        while self.U:
+            key, index = self.U[0]
+            if self.keys.get(index) == key:
+                return key
+            heapq.heappop(self.U)
+        return (INFINITY, INFINITY)
+
+    def update_vertex(self, index):
+        if index != self.index(self.goal_position):
+            best = INFINITY
+            for neighbor in self.neighbors(index):
+                if self.g[neighbor] + 1 < best:
+                    best = self.g[neighbor] + 1
+            self.rhs[index] = best
+        self.keys.pop(index, None)
+        if self.g[index] != self.rhs[index]:
+            self.push(index)
+
+    # Expand spaces until the g-value of the agent's position is correct.
+    # Return the number of spaces expanded by this call
+    def compute_shortest_path(self):
+        expanded = 0
+        start = self.index(self.start_position)
+        while self.top_key() < self.calculate_key(start) or self.rhs[start] != self.g[start]:
+            k_old, u = heapq.heappop(self.U)
+            del self.keys[u]
+            expanded += 1
+            k_new = self.calculate_key(u)
+            if k_old < k_new:
+                self.push(u)
+            elif self.g[u] > self.rhs[u]:
+                self.g[u] = self.rhs[u]
+                for s in self.neighbors(u):
+                    self.update_vertex(s)
+            else:
+                self.g[u] = INFINITY
+                self.update_vertex(u)
+                for s in self.neighbors(u):
+                    self.update_vertex(s)
+        self.expanded += expanded
+        return expanded
+
+    # Tell the planner that the agent has moved to position and detected the given new walls
+    def update_walls(self, position, new_walls):
+        self.start_position = list(position)
+        self.km += manhattan_distance_heuristic(self.last_position, self.start_position)
+        self.last_position = list(position)
+        for wall in new_walls:
+            index = self.index(wall)
+            self.update_vertex(index)
+            # The neighbors of the wall can no longer move through it, whether or not they are walls themselves
+            for neighbor in neighbor_indices(self.table, index, self.size, self.known_maze.cols):
+                if neighbor == -1:
+                    continue
+                self.update_vertex(neighbor)
+
+    # Return whether a path from the agent's position to the goal is known to exist
+    def path_exists(self):
+        return self.g[self.index(self.start_position)] != INFINITY
+
+    # Return the position of the next space on the shortest path from the agent's position to the goal
+    def next_position(self):
+        best = None
+        for neighbor in self.neighbors(self.index(self.start_position)):
+            if best is None or self.g[neighbor] < self.g[best]:
+                best = neighbor
+        return self.position(best)
+
+
+# Navigate through the maze using D* Lite, which repairs its previous search after new walls are found
+# instead of searching from scratch. Returns the same (success, actual_path, total_expand) as the walks in main.py
+def d_star_lite_walk(true_maze):
+    # The agent initially assumes that no spaces contain walls
+    known_maze = KnownMaze(true_maze.rows, true_maze.cols, true_maze.agent_row, true_maze.agent_col,
+                           true_maze.goal_row, true_maze.goal_col)
+    current_position = [true_maze.agent_row, true_maze.agent_col]
+    goal_position = [true_maze.goal_row, true_maze.goal_col]
+    actual_path = [MazeEntry(current_position[0], current_position[1], "0")]
+
+    planner = DStarLite(known_maze, current_position, goal_position)
+    planner.compute_shortest_path()
+    if not planner.path_exists():
+        return False, [], planner.expanded
+
+    # Iterate until the goal has been reached
+    while not (current_position[0] == true_maze.goal_row and current_position[1] == true_maze.goal_col):
+        # Search for any new walls adjacent to the agent, and if any are found, repair the search
+        new_walls = []
+        if update_adjacent_spaces(current_position, true_maze, known_maze, new_walls):
+            planner.update_walls(current_position, new_walls)
+            planner.compute_shortest_path()
+            if not planner.path_exists():
+                return False, [], planner.expanded
+
+        # Move to the neighbor with the shortest distance to the goal
+        current_position = planner.next_position()
+        planner.start_position = current_position
+        actual_path.append(MazeEntry(current_position[0], current_position[1], "0"))
+
+    return True, actual_path, planner.expanded
@@ -0,0 +1,328 @@
+import heapq
+from array import array
+from collections import deque
+
+from main import KnownMaze, MazeEntry, blocks_path, manhattan_distance_heuristic, neighbor_indices, neighbor_table, \
+    update_adjacent_spaces
+
+# The width and height of the clusters, in spaces
+CLUSTER_SIZE = 10
+# Entrances at least this wide get a transition at each end instead of a single one in the middle
+WIDE_ENTRANCE = 6
+
+
+# HierarchicalPlanner Class - plans paths through the known maze with Hierarchical Path-Finding A* (HPA*)
+# The maze is partitioned into square clusters. Wherever two adjacent clusters share a run of free spaces along their
+# border (an entrance), one or two pairs of facing spaces are chosen as transitions. The abstract graph has a node for
+# each space of a transition, an edge of cost 1 across every transition, and an edge between every two nodes of the
+# same cluster, weighted with their distance inside the cluster. A path is planned by searching the abstract graph,
+# then refined into spaces one cluster at a time. The paths found are near-optimal rather than shortest paths, but
+# a path is always found if one exists.
+# The abstract graph is built lazily, one cluster at a time, as the searches reach it. When new walls are found,
+# only the clusters and borders containing them are discarded, and rebuilt when a search next reaches them.
+# A cluster without known walls is a rectangle of free spaces, so its distances are Manhattan distances and its paths
+# are staircases, which are found without searching.
+# known_maze - the maze as the agent knows it
+# cluster_size - the width and height of the clusters
+# cluster_cols - the number of clusters in each row of clusters. Clusters are numbered row by row from 0
+# wall_counts - dictionary from cluster to the number of walls known in it, for the clusters which have any
+# borders - dictionary from (cluster, other) to the list of (space, other_space) transitions between two adjacent
+#           clusters, with cluster < other, space in cluster and other_space in other
+# edges - dictionary from cluster to its part of the abstract graph: a dictionary from each of its nodes to a list of
+#         (node, cost) edges
+# expanded - the number of spaces and abstract nodes expanded so far
+class HierarchicalPlanner:
+    def __init__(self, known_maze, cluster_size=CLUSTER_SIZE):
+        self.known_maze = known_maze
+        self.cluster_size = cluster_size
+        self.cluster_cols = (known_maze.cols + cluster_size - 1) // cluster_size
+        self.cluster_rows = (known_maze.rows + cluster_size - 1) // cluster_size
+        self.table = neighbor_table(known_maze.rows, known_maze.cols)
+        self.size = known_maze.rows * known_maze.cols
+        self.wall_counts = {}
+        self.borders = {}
+        self.edges = {}
+        self.expanded = 0
+        for index, status in known_maze.statuses.items():
+            if status == "0":
+                cluster = self.cluster_of(index)
+                self.wall_counts[cluster] = self.wall_counts.get(cluster, 0) + 1
+
+    def cluster_of(self, index):
+        row, col = divmod(index, self.known_maze.cols)
+        return row // self.cluster_size * self.cluster_cols + col // self.cluster_size
+
+    # Return the (top, left, bottom, right) bounds of a cluster, with bottom and right exclusive
+    def bounds(self, cluster):
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        top = cluster_row * self.cluster_size
+        left = cluster_col * self.cluster_size
+        return top, left, min(top + self.cluster_size, self.known_maze.rows), \
+            min(left + self.cluster_size, self.known_maze.cols)
+
+    # Return the clusters above, below, left of and right of a cluster, skipping those outside the maze
+    def adjacent_clusters(self, cluster):
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        adjacent = []
+        if cluster_row != 0:
+            adjacent.append(cluster - self.cluster_cols)
+        if cluster_row != self.cluster_rows - 1:
+            adjacent.append(cluster + self.cluster_cols)
+        if cluster_col != 0:
+            adjacent.append(cluster - 1)
+        if cluster_col != self.cluster_cols - 1:
+            adjacent.append(cluster + 1)
+        return adjacent
+
+    # Return the transitions between cluster and the adjacent cluster other, where cluster < other
+    def border(self, cluster, other):
+        transitions = self.borders.get((cluster, other))
+        if transitions is not None:
+            return transitions
+        cols = self.known_maze.cols
+        statuses = self.known_maze.statuses
+        top, left, bottom, right = self.bounds(cluster)
+        if other == cluster + 1 and other % self.cluster_cols != 0:
+            # other is to the right, so the border is the last column of cluster
+            pairs = [(row * cols + right - 1, row * cols + right) for row in range(top, bottom)]
+        else:
+            # other is below, so the border is the last row of cluster
+            pairs = [((bottom - 1) * cols + col, bottom * cols + col) for col in range(left, right)]
+        transitions = []
+        run = []
+        for space, other_space in pairs + [(-1, -1)]:
+            if space != -1 and statuses.get(space) != "0" and statuses.get(other_space) != "0":
+                run.append((space, other_space))
+            elif run:
+                if len(run) < WIDE_ENTRANCE:
+                    transitions.append(run[len(run) // 2])
+                else:
+                    transitions.append(run[0])
+                    transitions.append(run[-1])
+                run = []
+        self.borders[(cluster, other)] = transitions
+        return transitions
+
+    # Return the distances from source to each of targets within a cluster, for those which can be reached
+    # without leaving it. If parents is given, the parent of every space reached is recorded in it
+    def cluster_distances(self, cluster, source, targets, parents=None):
+        distances = {}
+        if cluster not in self.wall_counts and parents is None:
+            cols = self.known_maze.cols
+            source_position = divmod(source, cols)
+            for target in targets:
+                distances[target] = manhattan_distance_heuristic(source_position, divmod(target, cols))
+            return distances
+
+        # Breadth-first search from source, which finds shortest paths since every move costs 1
+        cols = self.known_maze.cols
+        statuses = self.known_maze.statuses
+        table = self.table
+        size = self.size
+        top, left, bottom, right = self.bounds(cluster)
+        remaining = set(targets)
+        reached = {source: 0}
+        frontier = deque([source])
+        while frontier and remaining:
+            index = frontier.popleft()
+            self.expanded += 1
+            cost = reached[index]
+            if index in remaining:
+                remaining.discard(index)
+                distances[index] = cost
+            for neighbor in neighbor_indices(table, index, size, cols):
+                if neighbor == -1:
+                    continue
+                if neighbor in reached or statuses.get(neighbor) == "0":
+                    continue
+                row, col = divmod(neighbor, cols)
+                if top <= row < bottom and left <= col < right:
+                    reached[neighbor] = cost + 1
+                    if parents is not None:
+                        parents[neighbor] = index
+                    frontier.append(neighbor)
+        return distances
+
+    # Return the part of the abstract graph in a cluster, building it if it has not been built since the cluster
+    # or one of its borders last changed
+    def cluster_edges(self, cluster):
+        edges = self.edges.get(cluster)
+        if edges is not None:
+            return edges
+        edges = {}
+        for other in self.adjacent_clusters(cluster):
+            if cluster < other:
+                for space, other_space in self.border(cluster, other):
+                    edges.setdefault(space, []).append((other_space, 1))
+            else:
+                for other_space, space in self.border(other, cluster):
+                    edges.setdefault(space, []).append((other_space, 1))
+        # Distances are symmetric, so each pair of nodes is only measured once
+        nodes = list(edges)
+        for i in range(len(nodes) - 1):
+            for other_node, distance in self.cluster_distances(cluster, nodes[i], nodes[i + 1:]).items():
+                edges[nodes[i]].append((other_node, distance))
+                edges[other_node].append((nodes[i], distance))
+        self.edges[cluster] = edges
+        return edges
+
+    # Tell the planner about newly detected walls, given as (row, col) positions as by update_adjacent_spaces.
+    # The clusters containing them, and the borders and clusters beyond any border they lie on, are discarded
+    def update_walls(self, new_walls):
+        cols = self.known_maze.cols
+        for row, col in new_walls:
+            index = row * cols + col
+            cluster = self.cluster_of(index)
+            self.wall_counts[cluster] = self.wall_counts.get(cluster, 0) + 1
+            self.edges.pop(cluster, None)
+            for neighbor in neighbor_indices(self.table, index, self.size, cols):
+                if neighbor == -1:
+                    continue
+                other = self.cluster_of(neighbor)
+                if other != cluster:
+                    self.borders.pop((min(cluster, other), max(cluster, other)), None)
+                    self.edges.pop(other, None)
+
+    # Return the spaces of a shortest path from source to target within a cluster, excluding source
+    def refine(self, cluster, source, target):
+        path = array("i")
+        if cluster not in self.wall_counts:
+            # A staircase: along the column to the row of target, then along the row
+            cols = self.known_maze.cols
+            row, col = divmod(source, cols)
+            target_row, target_col = divmod(target, cols)
+            step = 1 if target_row > row else -1
+            for r in range(row + step, target_row + step, step):
+                path.append(r * cols + col)
+            step = 1 if target_col > col else -1
+            for c in range(col + step, target_col + step, step):
+                path.append(target_row * cols + c)
+            return path
+        parents = {}
+        self.cluster_distances(cluster, source, [target], parents)
+        index = target
+        while index != source:
+            path.append(index)
+            index = parents[index]
+        path.reverse()
+        return path
+
+    # Plan a path from start_position to goal_position through the known maze, and return (success, path, expanded)
+    # like the searches in main.py: path is an array of the indices row * cols + col of its spaces, from the start to
+    # the goal, and expanded is the number of spaces and abstract nodes expanded by this call
+    def plan(self, start_position, goal_position):
+        expanded_before = self.expanded
+        cols = self.known_maze.cols
+        start = start_position[0] * cols + start_position[1]
+        goal = goal_position[0] * cols + goal_position[1]
+        start_cluster = self.cluster_of(start)
+        goal_cluster = self.cluster_of(goal)
+
+        # Connect the start and goal to the nodes of their clusters, and to each other if they share a cluster
+        start_nodes = list(self.cluster_edges(start_cluster))
+        if start_cluster == goal_cluster:
+            start_nodes.append(goal)
+        start_edges = self.cluster_distances(start_cluster, start, start_nodes)
+        goal_edges = self.cluster_distances(goal_cluster, goal, list(self.cluster_edges(goal_cluster)))
+
+        # A* search through the abstract graph, favoring high g-values like the searches in main.py
+        goal_row, goal_col = goal_position
+        g = {start: 0}
+        parents = {start: -1}
+        closed = set()
+        counter = 0
+        heap = [(manhattan_distance_heuristic(start_position, goal_position), 0, counter, start)]
+        while heap:
+            f, negative_cost, order, node = heapq.heappop(heap)
+            if node in closed:
+                continue
+            closed.add(node)
+            self.expanded += 1
+            if node == goal:
+                break
+            cost = -negative_cost
+            edges = self.cluster_edges(self.cluster_of(node)).get(node, [])
+            if node == start:
+                edges = edges + list(start_edges.items())
+            if node in goal_edges:
+                edges = edges + [(goal, goal_edges[node])]
+            for neighbor, distance in edges:
+                neighbor_cost = cost + distance
+                if neighbor not in closed and neighbor_cost < g.get(neighbor, neighbor_cost + 1):
+                    g[neighbor] = neighbor_cost
+                    parents[neighbor] = node
+                    row, col = divmod(neighbor, cols)
+                    counter += 1
+                    heapq.heappush(heap, (neighbor_cost + abs(row - goal_row) + abs(col - goal_col),
+                                          -neighbor_cost, counter, neighbor))
+        if goal not in closed:
+            return False, [], self.expanded - expanded_before
+
+        # Refine the abstract path into spaces: transitions are between adjacent spaces, and every other edge is
+        # refined within the cluster both its nodes lie in
+        nodes = []
+        node = goal
+        while node != -1:
+            nodes.append(node)
+            node = parents[node]
+        nodes.reverse()
+        path = array("i", [start])
+        for source, target in zip(nodes, nodes[1:]):
+            cluster = self.cluster_of(source)
+            if cluster == self.cluster_of(target):
+                path.extend(self.refine(cluster, source, target))
+            else:
+                path.append(target)
+        return True, path, self.expanded - expanded_before
+
+
+# Navigate through the maze, planning every path with HPA* (see HierarchicalPlanner).
+# Returns the same (success, actual_path, total_expand) as the walks in main.py
+# cluster_size - the width and height of the clusters of the planner
+# The other arguments are those of main.a_star_walk
+def hpa_star_walk(true_maze, cluster_size=CLUSTER_SIZE, lazy_replanning=True, counters=None, start=None, goal=None):
+    if start is None:
+        start = [true_maze.agent_row, true_maze.agent_col]
+    if goal is None:
+        goal = [true_maze.goal_row, true_maze.goal_col]
+
+    # The agent initially assumes that no spaces contain walls
+    known_maze = KnownMaze(true_maze.rows, true_maze.cols, start[0], start[1], goal[0], goal[1])
+    current_position = [start[0], start[1]]
+    actual_path = [MazeEntry(current_position[0], current_position[1], "0")]
+
+    planner = HierarchicalPlanner(known_maze, cluster_size)
+    success, planned_path, total_expand = planner.plan(current_position, goal)
+    if not success:
+        return False, [], total_expand
+    step = 0
+    planned_cells = set(planned_path)
+
+    # Iterate until the goal has been reached
+    while not (current_position[0] == goal[0] and current_position[1] == goal[1]):
+        # Search for any new walls adjacent to the agent. The planner is told about every one of them, but only
+        # replans if one lies on the planned path (or after every new wall, without lazy replanning)
+        new_walls = []
+        newWallFound = update_adjacent_spaces(current_position, true_maze, known_maze, new_walls)
+        if newWallFound:
+            planner.update_walls(new_walls)
+        if newWallFound and lazy_replanning and not blocks_path(new_walls, planned_cells, known_maze):
+            newWallFound = False
+            if counters is not None:
+                counters["avoided_replans"] = counters.get("avoided_replans", 0) + 1
+        elif newWallFound and counters is not None:
+            counters["replans"] = counters.get("replans", 0) + 1
+
+        if newWallFound:
+            success, planned_path, expanded = planner.plan(current_position, goal)
+            step = 0
+            planned_cells = set(planned_path)
+            total_expand += expanded
+            if not success:
+                return False, [], total_expand
+
+        step += 1
+        current_position[0], current_position[1] = divmod(planned_path[step], known_maze.cols)
+        actual_path.append(MazeEntry(current_position[0], current_position[1], "0"))
+
+    return True, actual_path, total_expand
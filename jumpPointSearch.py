@@ -0,0 +1,164 @@
+from array import array
+
+from main import SearchNode, SearchWorkspace, manhattan_distance_heuristic
+from openLists import BinaryHeapQueue
+
+
+# Jump Point Search (JPS) for the 4-connected mazes in main.py.
+# Instead of adding every neighbor of a node to the queue, JPS moves in a straight line until it reaches a space
+# where the path could need to turn (a jump point), and only adds jump points to the queue.
+# This prunes the many symmetric paths of open mazes, while still finding a shortest path.
+# Each row of walls is read once per search as an integer bitmask (see Maze.wall_mask),
+# so a horizontal jump takes a few integer operations however far it goes.
+
+
+# WallMasks Class - the walls of each row of the known maze as bitmasks, read lazily during one search
+# Spaces outside the maze count as walls
+# masks - dictionary from row to its bitmask
+# full - bitmask with a bit set for every column
+class WallMasks:
+    def __init__(self, known_maze):
+        self.known_maze = known_maze
+        self.masks = {}
+        self.full = (1 << known_maze.cols) - 1
+
+    def row(self, row):
+        if row < 0 or row >= self.known_maze.rows:
+            return self.full
+        mask = self.masks.get(row)
+        if mask is None:
+            mask = self.known_maze.wall_mask(row)
+            self.masks[row] = mask
+        return mask
+
+    # Return whether (row, col) is inside the maze and not known to contain a wall
+    def is_free(self, row, col):
+        return 0 <= col < self.known_maze.cols and not (self.row(row) >> col) & 1
+
+
+# Move horizontally from (row, col) in the direction d_col until a jump point is reached.
+# Return the position of the jump point, or None if a wall or the edge of the maze is reached first.
+# A jump point is the goal, or a space with a forced neighbor: a free space above or below it
+# whose own neighbor behind it (opposite to d_col) is a wall
+def jump_horizontal(row, col, d_col, goal_position, masks):
+    walls = masks.row(row)
+    above = masks.row(row - 1)
+    below = masks.row(row + 1)
+    if d_col > 0:
+        # Stop before the next wall, or at the edge of the maze
+        ahead = walls >> col
+        if ahead:
+            end = col + (ahead & -ahead).bit_length() - 1
+        else:
+            end = masks.known_maze.cols
+        forced = (((above << 1) & ~above) | ((below << 1) & ~below)) & masks.full
+        forced >>= col
+        if forced:
+            jump_col = col + (forced & -forced).bit_length() - 1
+        else:
+            jump_col = end
+        if goal_position[0] == row and col <= goal_position[1] < jump_col:
+            jump_col = goal_position[1]
+        if jump_col < end:
+            return [row, jump_col]
+        return None
+    # Moving left: the same, searching for the highest bit at or below col
+    below_col = (1 << (col + 1)) - 1
+    end = (walls & below_col).bit_length() - 1
+    forced = ((above >> 1) & ~above) | ((below >> 1) & ~below)
+    jump_col = (forced & below_col).bit_length() - 1
+    if goal_position[0] == row and jump_col < goal_position[1] <= col:
+        jump_col = goal_position[1]
+    if jump_col > end:
+        return [row, jump_col]
+    return None
+
+
+# Move vertically from (row, col) in the direction d_row until a jump point is reached.
+# Return the position of the jump point, or None if a wall or the edge of the maze is reached first.
+# A jump point is the goal, a space with a forced neighbor to its left or right,
+# or a space from which a horizontal move reaches a jump point
+def jump_vertical(row, col, d_row, goal_position, masks):
+    while masks.is_free(row, col):
+        if row == goal_position[0] and col == goal_position[1]:
+            return [row, col]
+        if (masks.is_free(row, col - 1) and not masks.is_free(row - d_row, col - 1)) or \
+                (masks.is_free(row, col + 1) and not masks.is_free(row - d_row, col + 1)):
+            return [row, col]
+        if (masks.is_free(row, col + 1) and jump_horizontal(row, col + 1, 1, goal_position, masks) is not None) or \
+                (masks.is_free(row, col - 1) and jump_horizontal(row, col - 1, -1, goal_position, masks) is not None):
+            return [row, col]
+        row += d_row
+    return None
+
+
+# Return the directions in which to search from node, pruning those which cannot lie on a shortest path
+# through its parent
+def pruned_directions(node, known_maze):
+    if node.parent == -1:
+        return [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    parent_row, parent_col = divmod(node.parent, known_maze.cols)
+    d_row = (node.row > parent_row) - (node.row < parent_row)
+    d_col = (node.col > parent_col) - (node.col < parent_col)
+    if d_col != 0:
+        return [(-1, 0), (1, 0), (0, d_col)]
+    return [(0, -1), (0, 1), (d_row, 0)]
+
+
+# Perform Jump Point Search on the known maze, beginning at initial_position, and targeting goal_position.
+# Returns the same (success, path, expanded) as forward_a_star_favor_high_g_values in main.py, with a path of
+# the same length, but only counts jump points as expanded
+# workspace - the SearchWorkspace to search in, which the search clears in O(1) (a new one if None)
+def jump_point_search(initial_position, goal_position, known_maze, open_list=BinaryHeapQueue, workspace=None):
+    initial_node = SearchNode(initial_position[0], initial_position[1], 0,
+                              manhattan_distance_heuristic(initial_position, goal_position))
+    q = open_list(True)
+    q.push(initial_node)
+    if workspace is None:
+        workspace = SearchWorkspace(known_maze.rows, known_maze.cols)
+    search_id = workspace.start_search()
+    expandedList = workspace.closed
+    parents = workspace.parents
+    masks = WallMasks(known_maze)
+    expanded = 0
+
+    while q:
+        x = q.pop()
+        index = x.row * known_maze.cols + x.col
+        if expandedList[index] == search_id:
+            continue
+        expandedList[index] = search_id
+        parents[index] = x.parent
+        expanded += 1
+
+        # If this node is the goal, follow the parents of each jump point up the tree,
+        # filling in the straight line of spaces between consecutive jump points
+        if x.row == goal_position[0] and x.col == goal_position[1]:
+            path = array("i", [index])
+            while parents[index] != -1:
+                parent = parents[index]
+                step = known_maze.cols if abs(parent - index) >= known_maze.cols else 1
+                if parent < index:
+                    step = -step
+                while index != parent:
+                    index += step
+                    path.append(index)
+            path.reverse()
+            return True, path, expanded
+
+        # Jump from the current node in every direction which was not pruned, and add each jump point to the queue
+        for d_row, d_col in pruned_directions(x, known_maze):
+            if not masks.is_free(x.row + d_row, x.col + d_col):
+                continue
+            if d_col != 0:
+                jump_point = jump_horizontal(x.row, x.col + d_col, d_col, goal_position, masks)
+            else:
+                jump_point = jump_vertical(x.row + d_row, x.col, d_row, goal_position, masks)
+            if jump_point is not None and \
+                    expandedList[jump_point[0] * known_maze.cols + jump_point[1]] != search_id:
+                i = SearchNode(jump_point[0], jump_point[1],
+                               x.cost + manhattan_distance_heuristic([x.row, x.col], jump_point),
+                               manhattan_distance_heuristic(jump_point, goal_position), index)
+                q.push(i)
+
+    return False, [], expanded
@@ -1,4 +1,14 @@
-import random, sys, time
+import random, time
+from array import array
+
+import searchKernel
+from openLists import BinaryHeapQueue
+from reportWriter import ReportWriter
+
+# The search kernel used by a_star_search, or None to always use its generic loop, e.g. to compare them.
+# The kernel is faster than the generic loop even when it runs interpreted, and faster still once compiled
+search_kernel = searchKernel
+SEARCH_KERNEL_COMPILED = not searchKernel.__file__.endswith(".py")
 
 
 # "A" signifies the agent
@@ -28,256 +38,521 @@ class MazeEntry:
         return (str(self.row) + "," + str(self.col))
 
 
+# SearchNode Class - a node in the tree built when performing A* search
+# Searches create one SearchNode per generated neighbor, so it uses __slots__ instead of a per-instance __dict__,
+# which makes it much smaller and faster to create than a MazeEntry
+# row, col - position in Maze
+# cost - cost up to that point in the Maze
+# heuristic - estimate of remaining cost to get to goal
+# parent - the index (row * cols + col) of the parent of the SearchNode in the tree, or -1 for the root
+class SearchNode:
+    __slots__ = ("row", "col", "cost", "heuristic", "parent")
+
+    def __init__(self, row, col, cost=None, heuristic=None, parent=-1):
+        self.row = row
+        self.col = col
+        self.cost = cost
+        self.heuristic = heuristic
+        self.parent = parent
+
+
+# Return a dense array holding the parent of every space in the search tree, at index row * cols + col.
+# A search records the parent of each node by the time it expands it, and -1 marks the root
+def new_parents(maze):
+    return array("i", [-1]) * (maze.rows * maze.cols)
+
+
+# Return the path from the root of the search tree to the space at index, by following the parent of each space.
+# Paths are arrays of indices row * cols + col, so building one only costs O(path length)
+def path_from_parents(parents, index):
+    path = array("i")
+    while index != -1:
+        path.append(index)
+        index = parents[index]
+    path.reverse()
+    return path
+
+
+# Return a path returned by a search, an array of indices row * cols + col, as a list of linked entries, each the
+# parent of the next and with its distance along the path as its cost, for the scripts which walk lists of MazeEntry
+# objects (e.g. mainUpdated.py) but search with a_star_search.
+# entry_class - the class of the entries, MazeEntry or a class with the same constructor
+def entries_from_path(path, cols, entry_class=MazeEntry):
+    entries = []
+    parent = None
+    for cost, index in enumerate(path):
+        entry = entry_class(index // cols, index % cols, "1", cost)
+        entry.parent = parent
+        entries.append(entry)
+        parent = entry
+    return entries
+
+
+# SearchWorkspace Class - the per-space arrays used by the searches, bound to the size of a maze and shared by every
+# search of a walk, so that replanning does not allocate anything proportional to the size of the maze.
+# The arrays are indexed by row * cols + col. Instead of being cleared before each search, they are invalidated by
+# incrementing search_id: a space has been added to the queue (or expanded) by the current search only if its byte
+# in generated (or closed) equals search_id, and its g-value is only valid if it has been added to the queue.
+# The bytes themselves are only cleared when search_id wraps around, once every 255 searches
+# rows, cols - dimensions of the mazes searched using this workspace
+# search_id - the id of the current search, from 1 to 255
+# The arrays are only allocated when the first search starts, so creating a workspace takes O(1) time and a walk
+# which never searches (see staircase_plan) allocates nothing proportional to the size of the maze
+# closed - bytearray holding the id of the search which last expanded each space
+# generated - bytearray holding the id of the search which last added each space to the queue
+# g - the lowest cost (g-value) with which the current search has added each space to the queue
+# parents - the parent of each space added to the queue by the current search, with the lowest cost (see new_parents)
+# h - the heuristics learned by Adaptive A* (see new_h_values), which are kept from one search to the next,
+# or None until learned_heuristics is first called
+# backward - the SearchWorkspace of the backward half of bidirectional_a_star, or None until it is first needed
+class SearchWorkspace:
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.search_id = 0
+        self.closed = None
+        self.generated = None
+        self.g = None
+        self.parents = None
+        self.h = None
+        self.backward = None
+
+    # Return the heuristics learned by Adaptive A*, allocating them if nothing has been learned yet
+    def learned_heuristics(self):
+        if self.h is None:
+            self.h = new_h_values(self)
+        return self.h
+
+    # Forget the heuristics learned by Adaptive A*, before using the workspace for a walk towards another goal
+    def forget_heuristics(self):
+        self.h = None
+
+    # Start a new search, in which no spaces have been added to the queue or expanded yet, and return its id
+    def start_search(self):
+        if self.closed is None:
+            self.closed = bytearray(self.rows * self.cols)
+            self.generated = bytearray(self.rows * self.cols)
+            self.g = array("i", [0]) * (self.rows * self.cols)
+            self.parents = new_parents(self)
+        self.search_id += 1
+        if self.search_id == 256:
+            self.closed[:] = bytes(len(self.closed))
+            self.generated[:] = bytes(len(self.generated))
+            self.search_id = 1
+        return self.search_id
+
+
+# The neighbor table built last, keyed by (rows, cols). Only the table of one size is kept, since every maze of a walk
+# or a benchmark run has the same size, so that running mazes of many sizes in one process does not keep a table for
+# each of them
+NEIGHBOR_TABLES = {}
+
+# The number of spaces above which mazes have no neighbor table, and the neighbors of each space are found with
+# bounds checks instead (see neighbor_indices). A table takes 16 bytes per space, more than the 10 bytes per space of a
+# SearchWorkspace, and looking neighbors up in it is no faster than the bounds checks, so it is only built for mazes of
+# up to about a million spaces, i.e. up to 16 MB
+NEIGHBOR_TABLE_MAX_SPACES = 1 << 20
+
+
+# Return the neighbor table of a maze with the given dimensions, which is built once per size and then shared,
+# or None if the maze has more than NEIGHBOR_TABLE_MAX_SPACES spaces.
+# The neighbors of the space at index = row * cols + col are stored at table[4 * index] to table[4 * index + 3],
+# as indices, in the order above, below, left, right, skipping those outside the maze and followed by -1 if
+# there are fewer than four. Walls are not taken into account, since they change as the agent discovers them.
+# The table takes 16 bytes per space, e.g. 16 MB for a maze of 1000x1000
+def neighbor_table(rows, cols):
+    if rows * cols > NEIGHBOR_TABLE_MAX_SPACES:
+        return None
+    table = NEIGHBOR_TABLES.get((rows, cols))
+    if table is None:
+        table = array("i", [-1]) * (4 * rows * cols)
+        for row in range(rows):
+            for col in range(cols):
+                index = row * cols + col
+                k = 4 * index
+                if row != 0:
+                    table[k] = index - cols
+                    k += 1
+                if row != rows - 1:
+                    table[k] = index + cols
+                    k += 1
+                if col != 0:
+                    table[k] = index - 1
+                    k += 1
+                if col != cols - 1:
+                    table[k] = index + 1
+        NEIGHBOR_TABLES.clear()
+        NEIGHBOR_TABLES[(rows, cols)] = table
+    return table
+
+
+# Return the indices of the neighbors of the space at index, in a maze of size = rows * cols spaces, in the order
+# above, below, left, right, with -1 in place of any outside the maze: from table, the neighbor_table of the maze, or
+# with bounds checks if it is None
+def neighbor_indices(table, index, size, cols):
+    if table is not None:
+        return table[4 * index:4 * index + 4]
+    col = index % cols
+    return (index - cols if index >= cols else -1, index + cols if index + cols < size else -1,
+            index - 1 if col != 0 else -1, index + 1 if col != cols - 1 else -1)
+
+
+# Return the random number generator to generate a maze from:
+# the global random module if seed is None, seed itself if it is already a random.Random instance,
+# or a new random.Random instance seeded with seed otherwise
+def make_rng(seed):
+    if seed is None:
+        return random
+    if isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
+
+
+# Return the seed for maze number maze_number of a benchmark run with the given master seed.
+# Every maze of a run can be regenerated on its own from its seed, e.g. to profile a slow outlier
+def maze_seed(master_seed, maze_number):
+    return str(master_seed) + ":" + str(maze_number)
+
+
 # Maze Class - the entire maze
 # content - a dictionary containing all MazeEntry objects within the Maze
 # rows, cols - dimensions of the maze
 # agent_row, agent_col - starting coordinates for the agent
 # goal_row, goal_col - coordinates for the goal
+# seed - a seed or random.Random instance to generate the maze from (the global random module if None)
+# Spaces should be read and written through get_status and set_status, which work for every kind of Maze
 class Maze:
-    def __init__(self, rows, cols, wallProbability, agent_row=None, agent_col=None, goal_row=None, goal_col=None):
+    def __init__(self, rows, cols, wallProbability, agent_row=None, agent_col=None, goal_row=None, goal_col=None,
+                 seed=None):
+        rng = make_rng(seed)
         self.content = {}
         self.rows = rows
         self.cols = cols
         if agent_row is None:
-            self.agent_row = random.randint(0, rows - 1)
+            self.agent_row = rng.randint(0, rows - 1)
         else:
             self.agent_row = agent_row
         if agent_col is None:
-            self.agent_col = random.randint(0, cols - 1)
+            self.agent_col = rng.randint(0, cols - 1)
         else:
             self.agent_col = agent_col
         if goal_row is None:
-            self.goal_row = random.randint(0, rows - 1)
+            self.goal_row = rng.randint(0, rows - 1)
         else:
             self.goal_row = goal_row
         if goal_col is None:
-            self.goal_col = random.randint(0, cols - 1)
+            self.goal_col = rng.randint(0, cols - 1)
         else:
             self.goal_col = goal_col
         for i in range(rows):
             for j in range(cols):
                 if (i != self.agent_row or j != self.agent_col) and (i != self.goal_row or j != self.goal_col):
-                    randomNumber = random.random()
+                    randomNumber = rng.random()
                     if randomNumber > wallProbability:
                         wallStatus = "1"
                     else:
                         wallStatus = "0"
-                    self.content[(i, j)] = MazeEntry(i, j, wallStatus)
-        self.content[(self.agent_row, self.agent_col)] = MazeEntry(self.agent_row, self.agent_col, "A")
-        self.content[(self.goal_row, self.goal_col)] = MazeEntry(self.goal_row, self.goal_col, "G")
+                    self.place(i, j, wallStatus)
+        self.place(self.agent_row, self.agent_col, "A")
+        self.place(self.goal_row, self.goal_col, "G")
+
+    # Store a newly generated space with the given status in the maze
+    def place(self, row, col, status):
+        self.content[(row, col)] = MazeEntry(row, col, status)
+
+    # Return the status of the space at (row, col)
+    def get_status(self, row, col):
+        return self.content[(row, col)].status
+
+    # Change the status of the space at (row, col), e.g. when the agent discovers a wall
+    def set_status(self, row, col, status):
+        self.content[(row, col)].status = status
+
+    # Return the status of the space at index row * cols + col
+    def get_status_at(self, index):
+        return self.content[divmod(index, self.cols)].status
+
+    # Change the status of the space at index row * cols + col
+    def set_status_at(self, index, status):
+        self.content[divmod(index, self.cols)].status = status
+
+    # Return the walls in the given row as an integer bitmask, with bit col set if (row, col) is a wall
+    def wall_mask(self, row):
+        mask = 0
+        for col in range(self.cols):
+            if self.get_status(row, col) == "0":
+                mask |= 1 << col
+        return mask
 
     def print(self):
         for i in range(self.rows):
             row = []
             for j in range(self.cols):
-                row.append(self.content[(i, j)].status)
+                row.append(self.get_status(i, j))
             print(row)
 
 
-# Navigate through the maze
-def forward_a_star_walk_favor_high_g_values(true_maze):
-    total_expand = 0
-
-    # In addition to the true maze which we are to navigate though, create a known_maze,
-    # representing the maze as the agent knows it. The agent does not initially know the maze,
-    # other than its starting point and the goal point. It initially assumes that no spaces contain walls.
-    known_maze = Maze(rows, cols, 0, true_maze.agent_row, true_maze.agent_col, true_maze.goal_row, true_maze.goal_col)
-    # print("Known Maze:")
-    # known_maze.print()
-
-    # Initialize the current position of the agent and its goal
-    current_position = [true_maze.agent_row, true_maze.agent_col]
-    goal_position = [true_maze.goal_row, true_maze.goal_col]
-
-    # Initialize a list to hold the actual path that the agent has followed.
-    # It begins by only containing a MazeEntry object representing its starting point
-    actual_path = [MazeEntry(current_position[0], current_position[1], "0")]
+# CompactMaze Class - a Maze which stores one byte per space instead of one MazeEntry object per space
+# Generating a CompactMaze consumes the same random numbers as generating a Maze, so both produce the same maze.
+# cells - a bytearray holding the status of the space at (row, col) at index row * cols + col
+# content - always None, since no MazeEntry objects are stored
+# If cells is passed in, the maze is built around it instead of being generated,
+# in which case the agent and goal coordinates must be given and wallProbability is ignored
+class CompactMaze(Maze):
+    def __init__(self, rows, cols, wallProbability, agent_row=None, agent_col=None, goal_row=None, goal_col=None,
+                 seed=None, cells=None):
+        if cells is None:
+            self.cells = bytearray(rows * cols)
+            super().__init__(rows, cols, wallProbability, agent_row, agent_col, goal_row, goal_col, seed)
+        else:
+            self.cells = cells
+            self.rows = rows
+            self.cols = cols
+            self.agent_row = agent_row
+            self.agent_col = agent_col
+            self.goal_row = goal_row
+            self.goal_col = goal_col
+        self.content = None
 
-    # Use A* search to generate a planned path to the goal based on the current state of the known_maze
-    success, planned_path, expanded = forward_a_star_favor_high_g_values(current_position, goal_position, known_maze)
+    def place(self, row, col, status):
+        self.cells[row * self.cols + col] = ord(status)
 
-    total_expand += expanded
+    def get_status(self, row, col):
+        return chr(self.cells[row * self.cols + col])
 
-    # If no path could be found, return false, indicating failure, and an empty list
-    if not success:
-        return False, [], total_expand
+    def set_status(self, row, col, status):
+        self.cells[row * self.cols + col] = ord(status)
 
-    # Iterate until the goal has been reached
-    while not (current_position[0] == true_maze.goal_row and current_position[1] == true_maze.goal_col):
-        # Search for any new walls adjacent to the agent in the true maze and update the known_maze
-        newWallFound = update_adjacent_spaces(current_position, true_maze, known_maze)
+    def get_status_at(self, index):
+        return chr(self.cells[index])
 
-        # If a new wall was found, use A* search to regenerate the planned path based on the new state of the known_maze
-        # If no path can be found, return false, indicating failure, and an empty list
-        if newWallFound:
-            success, planned_path, expanded = forward_a_star_favor_high_g_values(current_position, goal_position, known_maze)
-            if not success:
-                total_expand += expanded
-                return False, [], total_expand
+    def set_status_at(self, index, status):
+        self.cells[index] = ord(status)
 
-        # Remove the current element of the planned path and update the current position of the agent for the next iteration
-        planned_path.remove(planned_path[0])
-        current_position[0] = planned_path[0].row
-        current_position[1] = planned_path[0].col
+    def wall_mask(self, row):
+        # Map walls to "1" and everything else to "0", then read the row, reversed, as a binary number
+        bits = bytes(self.cells[row * self.cols:(row + 1) * self.cols]).translate(WALL_BITS)
+        return int(bits[::-1], 2)
 
-        # Add the updated current position of the agent to the actual path
-        actual_path.append(MazeEntry(current_position[0], current_position[1], "0"))
 
-    # If we break from the while loop (the agent reached the goal), return true, indicating success,
-    # and the actual path followed by the agent
-    total_expand += expanded
-    return True, actual_path, total_expand
+# Translation table used by CompactMaze.wall_mask
+WALL_BITS = bytes.maketrans(b"01AG", b"1000")
 
 
-# Navigate through the maze
-def forward_a_star_walk_favor_low_g_values(true_maze):
+# KnownMaze Class - the maze as the agent knows it, as an overlay on a maze in which every space is free ("1")
+# Only the spaces with any other status are stored: the agent, the goal and the walls which the agent has discovered.
+# Creating a KnownMaze therefore takes O(1) time whatever the size of the maze, and a walk only pays for the spaces
+# which the agent actually observes.
+# statuses - dictionary from the index row * cols + col of every space which is not free to its status
+# masks - dictionary from row to the bitmask of the walls in that row, as returned by wall_mask
+class KnownMaze(Maze):
+    def __init__(self, rows, cols, agent_row, agent_col, goal_row, goal_col):
+        self.rows = rows
+        self.cols = cols
+        self.agent_row = agent_row
+        self.agent_col = agent_col
+        self.goal_row = goal_row
+        self.goal_col = goal_col
+        self.content = None
+        self.statuses = {}
+        self.masks = {}
+        self.set_status(agent_row, agent_col, "A")
+        self.set_status(goal_row, goal_col, "G")
+
+    def get_status(self, row, col):
+        return self.statuses.get(row * self.cols + col, "1")
+
+    def set_status(self, row, col, status):
+        self.set_status_at(row * self.cols + col, status)
+
+    def get_status_at(self, index):
+        return self.statuses.get(index, "1")
+
+    def set_status_at(self, index, status):
+        if status == "1":
+            self.statuses.pop(index, None)
+        else:
+            self.statuses[index] = status
+        row, col = divmod(index, self.cols)
+        mask = self.masks.get(row, 0) & ~(1 << col)
+        if status == "0":
+            mask |= 1 << col
+        self.masks[row] = mask
+
+    def wall_mask(self, row):
+        return self.masks.get(row, 0)
+
+
+# Navigate through the maze, planning every path with search.
+# Every walk below is this walk with a different search:
+# search - any search taking the same arguments as forward_a_star_favor_high_g_values (including workspace)
+# and returning the same (success, path, expanded)
+# backward - move from the goal to the start instead, searching with search(start, position) from the current position
+# to the start, as backwards_a_star does. The path which is returned then runs from the goal to the start
+# lazy_replanning - only replan when a newly detected wall lies on the planned path. Walls are only ever added,
+# so a planned path which avoids every new wall is still a shortest path through the known_maze
+# counters - if given, a dictionary in which the number of "replans" and "avoided_replans" are counted
+# start, goal - the [row, col] positions of the agent and of the goal, if not those of true_maze
+# workspace - the SearchWorkspace for the searches of the walk (a new one if None), which may be shared
+# by walks through mazes of the same size, one at a time
+# initial_search - the search used for the first plan only, taking the same arguments as search, e.g.
+# bidirectional_a_star, or None to use search
+# closed_form - plan without searching whenever no known walls lie between the agent and its target, if search is one
+# of CLOSED_FORM_SEARCHES (see staircase_plan). This is always the case for the first plan, since the known_maze
+# starts without walls. Such plans are counted as "closed_form_plans" in counters
+# count_closed_form - count the spaces the search would have expanded for those plans, so that the totals are the
+# same as without closed_form, or count none if False
+def a_star_walk(true_maze, search, open_list=BinaryHeapQueue, backward=False, lazy_replanning=True, counters=None,
+                start=None, goal=None, workspace=None, initial_search=None, closed_form=True, count_closed_form=True):
+    if start is None:
+        start = [true_maze.agent_row, true_maze.agent_col]
+    if goal is None:
+        goal = [true_maze.goal_row, true_maze.goal_col]
     total_expand = 0
 
     # In addition to the true maze which we are to navigate though, create a known_maze,
     # representing the maze as the agent knows it. The agent does not initially know the maze,
     # other than its starting point and the goal point. It initially assumes that no spaces contain walls.
-    known_maze = Maze(rows, cols, 0, true_maze.agent_row, true_maze.agent_col, true_maze.goal_row, true_maze.goal_col)
+    known_maze = KnownMaze(true_maze.rows, true_maze.cols, start[0], start[1], goal[0], goal[1])
     # print("Known Maze:")
     # known_maze.print()
 
-    # Initialize the current position of the agent and its goal
-    current_position = [true_maze.agent_row, true_maze.agent_col]
-    goal_position = [true_maze.goal_row, true_maze.goal_col]
+    # Initialize the current position of the agent and the position it moves towards
+    if backward:
+        current_position = [goal[0], goal[1]]
+        target_position = [start[0], start[1]]
+    else:
+        current_position = [start[0], start[1]]
+        target_position = [goal[0], goal[1]]
 
     # Initialize a list to hold the actual path that the agent has followed.
     # It begins by only containing a MazeEntry object representing its starting point
     actual_path = [MazeEntry(current_position[0], current_position[1], "0")]
 
-    # Use A* search to generate a planned path to the goal based on the current state of the known_maze
-    success, planned_path, expanded = forward_a_star_favor_low_g_values(current_position, goal_position, known_maze)
+    # The searches of this walk all share one workspace, which each search clears in O(1)
+    if workspace is None:
+        workspace = SearchWorkspace(known_maze.rows, known_maze.cols)
 
-    total_expand += expanded
+    # favor_high_g - the closed form of search if it is used (see staircase_plan), or None to always search
+    favor_high_g = CLOSED_FORM_SEARCHES.get(search) if closed_form else None
 
-    # If no path could be found, return false, indicating failure, and an empty list
-    if not success:
-        return False, [], total_expand
-
-    # Iterate until the goal has been reached
-    while not (current_position[0] == true_maze.goal_row and current_position[1] == true_maze.goal_col):
-        # Search for any new walls adjacent to the agent in the true maze and update the known_maze
-        newWallFound = update_adjacent_spaces(current_position, true_maze, known_maze)
-
-        # If a new wall was found, use A* search to regenerate the planned path based on the new state of the known_maze
-        # If no path can be found, return false, indicating failure, and an empty list
-        if newWallFound:
-            success, planned_path, expanded = forward_a_star_favor_low_g_values(current_position, goal_position, known_maze)
-            if not success:
-                total_expand += expanded
-                return False, [], total_expand
-
-        # Remove the current element of the planned path and update the current position of the agent for the next iteration
-        planned_path.remove(planned_path[0])
-        current_position[0] = planned_path[0].row
-        current_position[1] = planned_path[0].col
-
-        # Add the updated current position of the agent to the actual path
-        actual_path.append(MazeEntry(current_position[0], current_position[1], "0"))
+    # Use A* search to generate a planned path to the goal based on the current state of the known_maze
+    if initial_search is None and favor_high_g is not None and \
+            no_walls_between(known_maze, current_position, target_position):
+        success, planned_path, expanded = staircase_plan(current_position, target_position, known_maze.cols,
+                                                         favor_high_g)
+        if not count_closed_form:
+            expanded = 0
+        if counters is not None:
+            counters["closed_form_plans"] = counters.get("closed_form_plans", 0) + 1
+    else:
+        if initial_search is None:
+            initial_search = search
+        if backward:
+            success, planned_path, expanded = initial_search(target_position, current_position, known_maze,
+                                                             open_list, workspace=workspace)
+        else:
+            success, planned_path, expanded = initial_search(current_position, target_position, known_maze,
+                                                             open_list, workspace=workspace)
+    # step - the position of the agent within planned_path, which is advanced instead of removing visited elements
+    step = 0
+    # planned_cells - the spaces on planned_path, used to check whether a new wall blocks it
+    planned_cells = set(planned_path)
 
-    # If we break from the while loop (the agent reached the goal), return true, indicating success,
-    # and the actual path followed by the agent
     total_expand += expanded
-    return True, actual_path, total_expand
 
-
-def adaptive_a_star_walk(true_maze):
-    total_expand = 0
-    known_maze = Maze(rows, cols, 0, true_maze.agent_row, true_maze.agent_col, true_maze.goal_row, true_maze.goal_col)
-    current_position = [true_maze.agent_row, true_maze.agent_col]
-    goal_position = [true_maze.goal_row, true_maze.goal_col]
-    actual_path = [MazeEntry(current_position[0], current_position[1], "0")]
-    success, planned_path, expanded = adaptive_a_star(current_position, goal_position, known_maze)
-
-    total_expand += expanded
+    # If no path could be found, return false, indicating failure, and an empty list
     if not success:
         return False, [], total_expand
 
     # Iterate until the goal has been reached
-    while not (current_position[0] == true_maze.goal_row and current_position[1] == true_maze.goal_col):
+    while not (current_position[0] == target_position[0] and current_position[1] == target_position[1]):
         # Search for any new walls adjacent to the agent in the true maze and update the known_maze
-        newWallFound = update_adjacent_spaces(current_position, true_maze, known_maze)
+        new_walls = []
+        newWallFound = update_adjacent_spaces(current_position, true_maze, known_maze, new_walls)
+        # New walls which do not lie on the planned path leave it a shortest path, so it is kept without replanning
+        if newWallFound and lazy_replanning and not blocks_path(new_walls, planned_cells, known_maze):
+            newWallFound = False
+            if counters is not None:
+                counters["avoided_replans"] = counters.get("avoided_replans", 0) + 1
+        elif newWallFound and counters is not None:
+            counters["replans"] = counters.get("replans", 0) + 1
 
         # If a new wall was found, use A* search to regenerate the planned path based on the new state of the known_maze
         # If no path can be found, return false, indicating failure, and an empty list
         if newWallFound:
-            success, planned_path, expanded = adaptive_a_star(current_position, goal_position, known_maze)
+            if favor_high_g is not None and no_walls_between(known_maze, current_position, target_position):
+                success, planned_path, expanded = staircase_plan(current_position, target_position,
+                                                                 known_maze.cols, favor_high_g)
+                if not count_closed_form:
+                    expanded = 0
+                if counters is not None:
+                    counters["closed_form_plans"] = counters.get("closed_form_plans", 0) + 1
+            elif backward:
+                success, planned_path, expanded = search(target_position, current_position, known_maze, open_list,
+                                                         workspace=workspace)
+            else:
+                success, planned_path, expanded = search(current_position, target_position, known_maze, open_list,
+                                                         workspace=workspace)
+            step = 0
+            planned_cells = set(planned_path)
+            total_expand += expanded
             if not success:
-                total_expand += expanded
                 return False, [], total_expand
 
-        # Remove the current element of the planned path and update the current position of the agent for the next iteration
-        planned_path.remove(planned_path[0])
-        current_position[0] = planned_path[0].row
-        current_position[1] = planned_path[0].col
+        # Advance to the next element of the planned path and update the current position of the agent for the next iteration
+        step += 1
+        current_position[0], current_position[1] = divmod(planned_path[step], known_maze.cols)
 
         # Add the updated current position of the agent to the actual path
         actual_path.append(MazeEntry(current_position[0], current_position[1], "0"))
 
     # If we break from the while loop (the agent reached the goal), return true, indicating success,
     # and the actual path followed by the agent
-    total_expand += expanded
     return True, actual_path, total_expand
 
 
-def backwards_a_star_walk(true_maze):
-    # In addition to the true maze which we are to navigate though, create a known_maze,
-    # representing the maze as the agent knows it. The agent does not initially know the maze,
-    # other than its starting point and the goal point. It initially assumes that no spaces contain walls.
-    known_maze = Maze(rows, cols, 0, true_maze.agent_row, true_maze.agent_col, true_maze.goal_row, true_maze.goal_col)
-    # print("Known Maze:")
-    # known_maze.print()
-
-    total_expand = 0
-
-    # Initialize the current position of the agent and its goal
-    current_position = [true_maze.agent_row, true_maze.agent_col]
-    goal_position = [true_maze.goal_row, true_maze.goal_col]
-
-    # Initialize a list to hold the actual path that the agent has followed.
-    # It begins by only containing a MazeEntry object representing its starting point
-    actual_path = [MazeEntry(goal_position[0], goal_position[1], "0")]
-
-    # Use A* search to generate a planned path to the goal based on the current state of the known_maze
-    success, planned_path, expanded = backwards_a_star(current_position, goal_position, known_maze)
-
-    total_expand += expanded
-
-    # If no path could be found, return false, indicating failure, and an empty list
-    if not success:
-        return False, []
-
-    # Iterate until the goal has been reached
-    while not (goal_position[0] == true_maze.agent_row and goal_position[1] == true_maze.agent_col):
-        # Search for any new walls adjacent to the agent in the true maze and update the known_maze
-        newWallFound = update_adjacent_spaces(goal_position, true_maze, known_maze)
+# Navigate through the maze
+# search - the search used to plan paths, forward_a_star_favor_high_g_values by default, or any other search
+# which a_star_walk accepts, e.g. jump_point_search
+# The other arguments are those of a_star_walk
+def forward_a_star_walk_favor_high_g_values(true_maze, open_list=BinaryHeapQueue, search=None, lazy_replanning=True,
+                                            counters=None, start=None, goal=None, workspace=None):
+    if search is None:
+        search = forward_a_star_favor_high_g_values
+    return a_star_walk(true_maze, search, open_list, False, lazy_replanning, counters, start, goal, workspace)
 
-        # If a new wall was found, use A* search to regenerate the planned path based on the new state of the known_maze
-        # If no path can be found, return false, indicating failure, and an empty list
-        if newWallFound:
-            try:
-                success, planned_path, expanded = backwards_a_star(current_position, goal_position, known_maze)
-            except:
-                print()
-            if not success:
-                total_expand += expanded
-                return False, [], total_expand
 
-        # Remove the current element of the planned path and update the current position of the agent for the next iteration
-        planned_path.remove(planned_path[0])
-        goal_position[0] = planned_path[0].row
-        goal_position[1] = planned_path[0].col
+# Navigate through the maze
+# The arguments are those of a_star_walk
+def forward_a_star_walk_favor_low_g_values(true_maze, open_list=BinaryHeapQueue, lazy_replanning=True, counters=None,
+                                           start=None, goal=None, workspace=None):
+    return a_star_walk(true_maze, forward_a_star_favor_low_g_values, open_list, False, lazy_replanning, counters,
+                       start, goal, workspace)
+
+
+# Navigate through the maze, learning improved heuristics with every search (Adaptive A*)
+# The arguments are those of a_star_walk
+def adaptive_a_star_walk(true_maze, open_list=BinaryHeapQueue, lazy_replanning=True, counters=None,
+                         start=None, goal=None, workspace=None):
+    # The heuristics learned by each search are kept for every later search of this walk.
+    # This is sound because the goal never moves and walls are only ever added to the known_maze.
+    # They are kept in the workspace shared by the searches, which each search otherwise clears in O(1).
+    # A workspace shared with earlier walks still holds the heuristics they learned, which are forgotten
+    if workspace is None:
+        workspace = SearchWorkspace(true_maze.rows, true_maze.cols)
+    else:
+        workspace.forget_heuristics()
+    return a_star_walk(true_maze, adaptive_a_star, open_list, False, lazy_replanning, counters, start, goal,
+                       workspace)
 
-        # Add the updated current position of the agent to the actual path
-        actual_path.append(MazeEntry(goal_position[0], goal_position[1], "0"))
 
-    # If we break from the while loop (the agent reached the goal), return true, indicating success,
-    # and the actual path followed by the agent
-    total_expand += expanded
-    return True, actual_path, total_expand
+# Navigate through the maze backward, from the goal to the start
+# The arguments are those of a_star_walk
+def backwards_a_star_walk(true_maze, open_list=BinaryHeapQueue, lazy_replanning=True, counters=None,
+                          start=None, goal=None, workspace=None):
+    return a_star_walk(true_maze, backwards_a_star, open_list, True, lazy_replanning, counters, start, goal,
+                       workspace)
 
 
 # Update the spaces in the known_maze which are adjacent to current_position
@@ -285,282 +560,383 @@ def backwards_a_star_walk(true_maze):
 # This allows the agent to update its understanding of where walls are in the maze.
 # If a new wall is detected, return true, indicating that regenerating the planned path is necessary.
 # Otherwise, return false.
-def update_adjacent_spaces(current_position, true_maze, known_maze):
+# new_walls - if given, a list to which the (row, col) position of every newly detected wall is appended
+# The neighbors are found with bounds checks, in the same order as in the neighbor table, so that walks which never
+# search do not build the neighbor table
+def update_adjacent_spaces(current_position, true_maze, known_maze, new_walls=None):
     newWallFound = False
-    if current_position[0] != 0:
-        if true_maze.content[(current_position[0] - 1, current_position[1])].status == "0" and known_maze.content[
-            (current_position[0] - 1, current_position[1])].status == "1":
-            known_maze.content[(current_position[0] - 1, current_position[1])].status = "0"
-            newWallFound = True
-    if current_position[0] != true_maze.rows - 1:
-        if true_maze.content[(current_position[0] + 1, current_position[1])].status == "0" and known_maze.content[
-            (current_position[0] + 1, current_position[1])].status == "1":
-            known_maze.content[(current_position[0] + 1, current_position[1])].status = "0"
-            newWallFound = True
-    if current_position[1] != 0:
-        if true_maze.content[(current_position[0], current_position[1] - 1)].status == "0" and known_maze.content[
-            (current_position[0], current_position[1] - 1)].status == "1":
-            known_maze.content[(current_position[0], current_position[1] - 1)].status = "0"
-            newWallFound = True
-    if current_position[1] != true_maze.cols - 1:
-        if true_maze.content[(current_position[0], current_position[1] + 1)].status == "0" and known_maze.content[
-            (current_position[0], current_position[1] + 1)].status == "1":
-            known_maze.content[(current_position[0], current_position[1] + 1)].status = "0"
+    row, col = current_position
+    cols = true_maze.cols
+    index = row * cols + col
+    neighbors = []
+    if row != 0:
+        neighbors.append(index - cols)
+    if row != true_maze.rows - 1:
+        neighbors.append(index + cols)
+    if col != 0:
+        neighbors.append(index - 1)
+    if col != cols - 1:
+        neighbors.append(index + 1)
+    for neighbor in neighbors:
+        if true_maze.get_status_at(neighbor) == "0" and known_maze.get_status_at(neighbor) == "1":
+            known_maze.set_status_at(neighbor, "0")
             newWallFound = True
+            if new_walls is not None:
+                new_walls.append(divmod(neighbor, true_maze.cols))
     return newWallFound
 
 
-# Perform A* search on the known maze, beginning at initial_position, and targeting goal_position
-def forward_a_star_favor_high_g_values(initial_position, goal_position, known_maze):
-    # create the initial node in the tree based on the initial_position
-    initial_node = MazeEntry(initial_position[0], initial_position[1], "1", 0,
-                             manhattan_distance_heuristic(initial_position, goal_position))
-
-    # initialize the queue with only the initial_node
-    q = [initial_node]
-
-    # initialize the list of expanded nodes (implemented using a dictionary)
-    expandedList = {}
-
+# Return whether any of the new walls lies on a planned path
+# planned_cells - the set of indices row * cols + col of the spaces on the planned path
+def blocks_path(new_walls, planned_cells, known_maze):
+    for row, col in new_walls:
+        if row * known_maze.cols + col in planned_cells:
+            return True
+    return False
+
+
+# ManhattanHeuristic Class - the Manhattan distance to the target of a search, as the heuristic of a_star_search
+# target_row, target_col - position of the target of the search
+# learns - whether the heuristic learns from every successful search, in which case a_star_search calls
+# learn(expanded_nodes, goal_cost, cols) with every node which the search expanded and the cost of the target
+class ManhattanHeuristic:
+    learns = False
+
+    def __init__(self, target_position):
+        self.target_row = target_position[0]
+        self.target_col = target_position[1]
+
+    # Return the heuristic of the space (row, col), at index row * cols + col
+    def h(self, row, col, index):
+        return abs(row - self.target_row) + abs(col - self.target_col)
+
+
+# Return a dense array holding one learned heuristic per space of the maze, at index row * cols + col.
+# A value of -1 means that nothing has been learned yet, so the Manhattan distance heuristic is used
+def new_h_values(maze):
+    return array("i", [-1]) * (maze.rows * maze.cols)
+
+
+# LearnedHeuristic Class - the heuristics learned by Adaptive A*, or the Manhattan distance where nothing was learned
+# h_values - the learned heuristics, as returned by new_h_values
+class LearnedHeuristic(ManhattanHeuristic):
+    learns = True
+
+    def __init__(self, target_position, h_values):
+        super().__init__(target_position)
+        self.h_values = h_values
+
+    def h(self, row, col, index):
+        h = self.h_values[index]
+        if h < 0:
+            return abs(row - self.target_row) + abs(col - self.target_col)
+        return h
+
+    # Update the heuristic of every expanded node to goal_cost - cost
+    # (In Accordance With Adaptive A* Heuristic Update Equation)
+    def learn(self, expanded_nodes, goal_cost, cols):
+        h_values = self.h_values
+        for node in expanded_nodes:
+            h_values[node.row * cols + node.col] = goal_cost - node.cost
+
+
+# SearchFrontier Class - the queue (open list) of one A* search and its nodes in a SearchWorkspace, expanded one node
+# at a time. a_star_search expands one frontier until it reaches its target, and bidirectional_a_star expands two,
+# one from each end, until they meet
+# q - the open list, which initially holds only the root
+# h - the heuristic of the search, as the h method of a ManhattanHeuristic
+# search_id - the id of the search in its SearchWorkspace
+# closed, generated, g, parents - the arrays of the SearchWorkspace (see SearchWorkspace). The parent of every space is
+# recorded in parents when it is added to the queue with a lower cost
+class SearchFrontier:
+    def __init__(self, root_position, known_maze, open_list, workspace, favor_high_g, h):
+        self.known_maze = known_maze
+        self.cols = known_maze.cols
+        self.size = known_maze.rows * known_maze.cols
+        self.table = neighbor_table(known_maze.rows, known_maze.cols)
+        self.h = h
+        self.search_id = workspace.start_search()
+        self.closed = workspace.closed
+        self.generated = workspace.generated
+        self.g = workspace.g
+        self.parents = workspace.parents
+
+        # create the initial node in the tree based on the root_position, and initialize the queue with only it
+        self.root = root_position[0] * self.cols + root_position[1]
+        self.generated[self.root] = self.search_id
+        self.g[self.root] = 0
+        self.parents[self.root] = -1
+        self.q = open_list(favor_high_g)
+        self.q.push(SearchNode(root_position[0], root_position[1], 0,
+                               h(root_position[0], root_position[1], self.root)))
+
+    # Pop the node with the lowest cost + heuristic which has not been expanded yet off of the queue,
+    # add it to the expanded list and return it, or return None if the queue is empty
+    def pop(self):
+        q = self.q
+        expandedList = self.closed
+        search_id = self.search_id
+        cols = self.cols
+        while q:
+            x = q.pop()
+            index = x.row * cols + x.col
+            if expandedList[index] != search_id:
+                expandedList[index] = search_id
+                return x
+        return None
+
+    # Look up the neighbors of the node x (see neighbor_indices), and for each neighbor which does not
+    # contain a wall, has not been expanded and is not already in the queue with the same or a lower cost,
+    # create a SearchNode object to represent it, and add it to the queue,
+    # which orders nodes by increasing cost + heuristic
+    def add_neighbors(self, x):
+        table = self.table
+        get_status = self.known_maze.get_status
+        push = self.q.push
+        h = self.h
+        search_id = self.search_id
+        expandedList = self.closed
+        generated = self.generated
+        g = self.g
+        parents = self.parents
+        cols = self.cols
+        index = x.row * cols + x.col
+        cost = x.cost + 1
+        for neighbor in neighbor_indices(table, index, self.size, cols):
+            if neighbor == -1:
+                continue
+            if expandedList[neighbor] == search_id or (generated[neighbor] == search_id and g[neighbor] <= cost):
+                continue
+            row, col = divmod(neighbor, cols)
+            if get_status(row, col) != "0":
+                generated[neighbor] = search_id
+                g[neighbor] = cost
+                parents[neighbor] = index
+                push(SearchNode(row, col, cost, h(row, col, neighbor), index))
+
+
+# Perform A* search on the known maze, between initial_position and goal_position.
+# Every search below is this search with different policies:
+# favor_high_g - break ties between nodes with the same cost + heuristic in favor of the higher cost (g-value) if True,
+# of the lower cost if False, or in the order they were added to the queue if None (as the sorted lists of
+# astarExpand.py, astarPath.py and backwardsAstar.py do)
+# backward - search from goal_position to initial_position instead, in which case the path runs from goal_position
+# heuristic - the heuristic of the search, with the same methods as ManhattanHeuristic
+# (a ManhattanHeuristic to the target of the search if None)
+# workspace - the SearchWorkspace to search in, which the search clears in O(1) (a new one if None)
+def a_star_search(initial_position, goal_position, known_maze, open_list=BinaryHeapQueue, workspace=None,
+                  favor_high_g=True, backward=False, heuristic=None):
+    if backward:
+        root_position, target_position = goal_position, initial_position
+    else:
+        root_position, target_position = initial_position, goal_position
+    if heuristic is None:
+        heuristic = ManhattanHeuristic(target_position)
+    cols = known_maze.cols
+    target = target_position[0] * cols + target_position[1]
+
+    # The expanded list, the cost (g-value) of every node added to the queue and the parents of the nodes are all
+    # kept in the workspace
+    if workspace is None:
+        workspace = SearchWorkspace(known_maze.rows, known_maze.cols)
+
+    # Search with the kernel instead where it supports the open list, heuristic and maze
+    if search_kernel is not None and open_list is BinaryHeapQueue and isinstance(known_maze, KnownMaze) and \
+            type(heuristic) in (ManhattanHeuristic, LearnedHeuristic):
+        search_id = workspace.start_search()
+        root = root_position[0] * cols + root_position[1]
+        success, expanded = search_kernel.search(neighbor_table(known_maze.rows, known_maze.cols),
+                                                 known_maze.statuses, cols, root, target, favor_high_g,
+                                                 workspace.closed, workspace.generated, workspace.g,
+                                                 workspace.parents, search_id,
+                                                 heuristic.h_values if heuristic.learns else None)
+        if success:
+            return True, path_from_parents(workspace.parents, target), expanded
+        return False, [], expanded
+
+    # initialize the queue (open list) with only the root, and the expanded nodes themselves if the heuristic
+    # learns from them
+    frontier = SearchFrontier(root_position, known_maze, open_list, workspace, favor_high_g, heuristic.h)
+    expanded_nodes = [] if heuristic.learns else None
     expanded = 0
 
-    # Iterate as long as the queue is not empty
-    while q:
-        # Pop the first node off of the queue
-        x = q[0]
-        q.remove(x)
-
-        # If this node has already been expanded, continue to the next iteration
-        if expandedList.setdefault((x.row, x.col)) is not None:
-            continue
-
-        # Add this node to the expanded list
-        expandedList[(x.row, x.col)] = True
+    # Iterate as long as the queue still holds nodes which have not been expanded
+    while True:
+        # Pop the node with the lowest cost + heuristic off of the queue, and add it to the expanded list
+        x = frontier.pop()
+        if x is None:
+            break
+        if expanded_nodes is not None:
+            expanded_nodes.append(x)
 
         expanded += 1
 
-        # If this node is the goal, return True, indicating success, as well as the path,
+        # If this node is the target, return True, indicating success, as well as the path,
         # Which is obtaining by following the parents of each node, up the tree
-        if x.row == goal_position[0] and x.col == goal_position[1]:
-            path = [x]
-            while x.parent is not None:
-                x = x.parent
-                path.append(x)
-            path.reverse()
-            # Passed - A Star Test (and thus findNeighbors is verified)
-            # print("Path From Forwards A Star:")
-            # for i in path:
-            #   i.print()
-            return True, path, expanded
-
-        # Find the neighbors of the current node, and for each neighbor, create a MazeEntry object to represent it,
-        # and add it to the queue in order of increasing cost + heuristic
-        for i in findNeighbors([x.row, x.col], known_maze):
-            if expandedList.setdefault((i.row, i.col)) is None:
-                i.parent = x
-                i.cost = x.cost + 1
-                i.heuristic = manhattan_distance_heuristic([i.row, i.col], goal_position)
-                q = addToQueueFavorHighGValues(q, i)
-
-    # If we exited from the while loop, meaning that the queue became empty without finding the goal,
-    # return false, indicating failure, and an empty list
-    return False, [], expanded
+        # (as an array of indices row * cols + col)
+        index = x.row * cols + x.col
+        if index == target:
+            if expanded_nodes is not None:
+                heuristic.learn(expanded_nodes, x.cost, cols)
+            return True, path_from_parents(workspace.parents, index), expanded
 
+        frontier.add_neighbors(x)
 
-# Perform A* search on the known maze, beginning at initial_position, and targeting goal_position
-def forward_a_star_favor_low_g_values(initial_position, goal_position, known_maze):
-    # create the initial node in the tree based on the initial_position
-    initial_node = MazeEntry(initial_position[0], initial_position[1], "1", 0,
-                             manhattan_distance_heuristic(initial_position, goal_position))
-
-    # initialize the queue with only the initial_node
-    q = [initial_node]
-
-    # initialize the list of expanded nodes (implemented using a dictionary)
-    expandedList = {}
-
-    expanded = 0
-
-    # Iterate as long as the queue is not empty
-    while q:
-        # Pop the first node off of the queue
-        x = q[0]
-        q.remove(x)
-
-        # If this node has already been expanded, continue to the next iteration
-        if expandedList.setdefault((x.row, x.col)) is not None:
-            continue
-
-        # Add this node to the expanded list
-        expandedList[(x.row, x.col)] = True
-
-        expanded += 1
-
-        # If this node is the goal, return True, indicating success, as well as the path,
-        # Which is obtaining by following the parents of each node, up the tree
-        if x.row == goal_position[0] and x.col == goal_position[1]:
-            path = [x]
-            while x.parent is not None:
-                x = x.parent
-                path.append(x)
-            path.reverse()
-            # Passed - A Star Test (and thus findNeighbors is verified)
-            # print("Path From Forwards A Star:")
-            # for i in path:
-            #   i.print()
-            return True, path, expanded
-
-        # Find the neighbors of the current node, and for each neighbor, create a MazeEntry object to represent it,
-        # and add it to the queue in order of increasing cost + heuristic
-        for i in findNeighbors([x.row, x.col], known_maze):
-            if expandedList.setdefault((i.row, i.col)) is None:
-                i.parent = x
-                i.cost = x.cost + 1
-                i.heuristic = manhattan_distance_heuristic([i.row, i.col], goal_position)
-                q = addToQueueFavorLowGValues(q, i)
-
-    # If we exited from the while loop, meaning that the queue became empty without finding the goal,
+    # If we exited from the while loop, meaning that the queue became empty without finding the target,
     # return false, indicating failure, and an empty list
     return False, [], expanded
 
 
 # Perform A* search on the known maze, beginning at initial_position, and targeting goal_position
-def adaptive_a_star(initial_position, goal_position, known_maze):
-    # create the initial node in the tree based on the initial_position
-    initial_node = MazeEntry(initial_position[0], initial_position[1], "1", 0,
-                             manhattan_distance_heuristic(initial_position, goal_position))
-
-    # initialize the queue with only the initial_node
-    q = [initial_node]
-
-    # initialize the list of expanded nodes (implemented using a dictionary)
-    expandedList = {}
-
-    expanded = 0
-
-    # Iterate as long as the queue is not empty
-    while q:
-        # Pop the first node off of the queue
-        x = q[0]
-        q.remove(x)
-
-        # If this node has already been expanded, continue to the next iteration
-        if expandedList.setdefault((x.row, x.col)) is not None:
-            continue
-
-        # Add this node to the expanded list
-        expandedList[(x.row, x.col)] = True
-
-        expanded += 1
-
-        # If this node is the goal, return True, indicating success, as well as the path,
-        # Which is obtaining by following the parents of each node, up the tree
-        if x.row == goal_position[0] and x.col == goal_position[1]:
-            path = [x]
-            while x.parent is not None:
-                x = x.parent
-                path.append(x)
-            path.reverse()
-            # Update Every Expanded Node According to Adaptive A* Search
-            # By Overwriting It With an Identical Node But With Heuristic Defined as goal_cost - cost
-            # (In Accordance With Adaptive A* Heuristic Update Equation)
-            for i in expandedList:
-                status = known_maze.content[(i[0], i[1])].status
-                cost = known_maze.content[(i[0], i[1])].cost
-                if cost is None:
-                    cost = 0
-                goal_cost = len(path) - 1
-                known_maze.content[(i[0], i[1])] = MazeEntry(i[0], i[1], status, cost, goal_cost - cost)
-            # Passed - A Star Test (and thus findNeighbors is verified)
-            # print("Path From Forwards A Star:")
-            # for i in path:
-            #   i.print()
-            return True, path, expanded
-
-        # Find the neighbors of the current node, and for each neighbor, create a MazeEntry object to represent it,
-        # and add it to the queue in order of increasing cost + heuristic
-        for i in findNeighbors([x.row, x.col], known_maze):
-            if expandedList.setdefault((i.row, i.col)) is None:
-                i.parent = x
-                i.cost = x.cost + 1
-                if i.heuristic is None:
-                    i.heuristic = manhattan_distance_heuristic([i.row, i.col], goal_position)
-                q = addToQueueFavorHighGValues(q, i)
-
-    # If we exited from the while loop, meaning that the queue became empty without finding the goal,
-    # return false, indicating failure, and an empty list
-    return False, [], expanded
-
+# workspace - the SearchWorkspace to search in, which the search clears in O(1) (a new one if None)
+def forward_a_star_favor_high_g_values(initial_position, goal_position, known_maze, open_list=BinaryHeapQueue,
+                                       workspace=None):
+    return a_star_search(initial_position, goal_position, known_maze, open_list, workspace)
 
-def backwards_a_star(initial_position, goal_position, known_maze):
-    # create the initial node in the tree based on the initial_position
-    initial_node = MazeEntry(goal_position[0], goal_position[1], "1", 0,
-                             manhattan_distance_heuristic(goal_position, initial_position))
-
-    # initialize the queue with only the initial_node
-    q = [initial_node]
-
-    # initialize the list of expanded nodes (implemented using a dictionary)
-    expandedList = {}
 
+# Perform A* search on the known maze, beginning at initial_position, and targeting goal_position
+# workspace - the SearchWorkspace to search in, which the search clears in O(1) (a new one if None)
+def forward_a_star_favor_low_g_values(initial_position, goal_position, known_maze, open_list=BinaryHeapQueue,
+                                      workspace=None):
+    return a_star_search(initial_position, goal_position, known_maze, open_list, workspace, favor_high_g=False)
+
+
+# Perform Adaptive A* search on the known maze, beginning at initial_position, and targeting goal_position
+# workspace - the SearchWorkspace to search in (a new one if None), which the search clears in O(1), except for the
+# learned heuristics (see SearchWorkspace.learned_heuristics), which are read during the search and updated when
+# it succeeds
+def adaptive_a_star(initial_position, goal_position, known_maze, open_list=BinaryHeapQueue, workspace=None):
+    if workspace is None:
+        workspace = SearchWorkspace(known_maze.rows, known_maze.cols)
+    return a_star_search(initial_position, goal_position, known_maze, open_list, workspace,
+                         heuristic=LearnedHeuristic(goal_position, workspace.learned_heuristics()))
+
+
+# Perform A* search on the known maze, beginning at goal_position, and targeting initial_position
+# workspace - the SearchWorkspace to search in, which the search clears in O(1) (a new one if None)
+def backwards_a_star(initial_position, goal_position, known_maze, open_list=BinaryHeapQueue, workspace=None):
+    return a_star_search(initial_position, goal_position, known_maze, open_list, workspace, backward=True)
+
+
+# The searches whose plans a_star_walk finds without searching when no known walls lie between the agent and its
+# target (see staircase_plan), mapped to whether they favor high g-values. Adaptive A* finds the same plans as
+# forward_a_star_favor_high_g_values there, since its learned heuristics can never exceed the distance to the goal
+CLOSED_FORM_SEARCHES = {forward_a_star_favor_high_g_values: True,
+                        forward_a_star_favor_low_g_values: False,
+                        adaptive_a_star: True,
+                        backwards_a_star: True}
+
+
+# Perform bidirectional A* search on the known maze: a forward search from initial_position towards goal_position
+# and a backward search from goal_position towards initial_position, two SearchFrontiers which each expand a node in
+# turn from whichever has the shorter queue, until they meet in the middle. Returns the same (success, path,
+# expanded) as the other searches, with expanded counting the nodes expanded by both.
+# Whenever one search expands a node which the other has added to its queue (including its root), the path through
+# that node is a candidate, and the shortest so far is kept. The search stops once one search pops a node whose
+# cost + heuristic is at least the cost of that path, since every path through the nodes it has not expanded then
+# costs at least as much, or once either queue runs out. A search whose queue runs out has expanded every space it
+# can reach, including the root of the other search if there is a path. With unit costs and the Manhattan distance,
+# which is consistent, the path found is a shortest path.
+# workspace - the SearchWorkspace of the forward search, which the search clears in O(1) (a new one if None).
+# The backward search uses workspace.backward, which is created when first needed
+# favor_high_g - break ties between equal f-values in favor of higher g-values in both searches if True
+def bidirectional_a_star(initial_position, goal_position, known_maze, open_list=BinaryHeapQueue, workspace=None,
+                         favor_high_g=True):
+    if workspace is None:
+        workspace = SearchWorkspace(known_maze.rows, known_maze.cols)
+    if workspace.backward is None:
+        workspace.backward = SearchWorkspace(known_maze.rows, known_maze.cols)
+    cols = known_maze.cols
+    forward = SearchFrontier(initial_position, known_maze, open_list, workspace, favor_high_g,
+                             ManhattanHeuristic(goal_position).h)
+    backward = SearchFrontier(goal_position, known_maze, open_list, workspace.backward, favor_high_g,
+                              ManhattanHeuristic(initial_position).h)
+
+    # best_cost - the cost of the shortest path found so far, through the node meeting
+    best_cost = None
+    meeting = -1
     expanded = 0
-
-    # Iterate as long as the queue is not empty
-    while q:
-        # Pop the first node off of the queue
-        x = q[0]
-        q.remove(x)
-
-        # If this node has already been expanded, continue to the next iteration
-        if expandedList.setdefault((x.row, x.col)) is not None:
-            continue
-
-        # Add this node to the expanded list
-        expandedList[(x.row, x.col)] = True
+    while True:
+        if len(forward.q) <= len(backward.q):
+            frontier, other = forward, backward
+        else:
+            frontier, other = backward, forward
+        x = frontier.pop()
+        if x is None or (best_cost is not None and x.cost + x.heuristic >= best_cost):
+            break
         expanded += 1
 
-        # If this node is the goal, return True, indicating success, as well as the path,
-        # Which is obtaining by following the parents of each node, up the tree
-        if x.row == initial_position[0] and x.col == initial_position[1]:
-            path = [x]
-            while x.parent is not None:
-                x = x.parent
-                path.append(x)
-            path.reverse()
-            # Passed - A Star Test (and thus findNeighbors is verified)
-            # print("Path From Backwards A Star:")
-            # for i in path:
-            #   i.print()
-            return True, path, expanded
-
-        # Find the neighbors of the current node, and for each neighbor, create a MazeEntry object to represent it,
-        # and add it to the queue in order of increasing cost + heuristic
-        for i in findNeighbors([x.row, x.col], known_maze):
-            if expandedList.setdefault((i.row, i.col)) is None:
-                i.parent = x
-                i.cost = x.cost + 1
-                i.heuristic = manhattan_distance_heuristic([i.row, i.col], initial_position)
-                q = addToQueueFavorHighGValues(q, i)
-
-    # If we exited from the while loop, meaning that the queue became empty without finding the goal,
-    # return false, indicating failure, and an empty list
-    return False, [], expanded
+        # Meet the other search at this node if it has added it to its queue
+        index = x.row * cols + x.col
+        if other.generated[index] == other.search_id:
+            cost = x.cost + other.g[index]
+            if best_cost is None or cost < best_cost:
+                best_cost = cost
+                meeting = index
+
+        frontier.add_neighbors(x)
+
+    if best_cost is None:
+        return False, [], expanded
+
+    # Join the forward path to the meeting with the backward path from it, which runs from the goal to the meeting
+    path = path_from_parents(workspace.parents, meeting)
+    backward_path = path_from_parents(workspace.backward.parents, meeting)
+    backward_path.pop()
+    backward_path.reverse()
+    path.extend(backward_path)
+    return True, path, expanded
+
+
+# Return whether no known walls lie in the rectangle with opposite corners position and other_position.
+# The known_maze keeps the bitmask of the walls in every row up to date as walls are discovered (see wall_mask),
+# so this only reads one integer per row of the rectangle
+def no_walls_between(known_maze, position, other_position):
+    left = min(position[1], other_position[1])
+    box = ((1 << (abs(position[1] - other_position[1]) + 1)) - 1) << left
+    for row in range(min(position[0], other_position[0]), max(position[0], other_position[0]) + 1):
+        if known_maze.wall_mask(row) & box:
+            return False
+    return True
+
+
+# Return the (success, path, expanded) which a_star_search returns when searching from root_position to
+# target_position with no known walls between them (see no_walls_between), without searching.
+# Every space in the rectangle between them then has a cost + heuristic equal to their Manhattan distance, and every
+# space outside it a higher one. Favoring high g-values, the search expands exactly the spaces of its path, which
+# runs along the column to the row of target_position and then along the row, since the neighbors above and below
+# are added to the queue first. Favoring low g-values, it finds the same path, but only after expanding every space
+# in the rectangle
+def staircase_plan(root_position, target_position, cols, favor_high_g=True):
+    row, col = root_position
+    target_row, target_col = target_position
+    path = array("i", [row * cols + col])
+    step = 1 if target_row > row else -1
+    for r in range(row + step, target_row + step, step):
+        path.append(r * cols + col)
+    step = 1 if target_col > col else -1
+    for c in range(col + step, target_col + step, step):
+        path.append(target_row * cols + c)
+    if favor_high_g:
+        return True, path, len(path)
+    return True, path, (abs(target_row - row) + 1) * (abs(target_col - col) + 1)
 
 
 # Find all neighbors of a node based on its current position and the content of the known maze
 # Any neighbors which contain a wall are ignored
+# Each neighbor is returned as a new SearchNode
 def findNeighbors(current_position, known_maze):
     neighbors = []
-    if current_position[0] != 0 and known_maze.content[(current_position[0] - 1, current_position[1])].status != "0":
-        neighbors.append(MazeEntry(current_position[0] - 1, current_position[1], "1"))
-    if current_position[0] != known_maze.rows - 1 and known_maze.content[
-        (current_position[0] + 1, current_position[1])].status != "0":
-        neighbors.append(MazeEntry(current_position[0] + 1, current_position[1], "1"))
-    if current_position[1] != 0 and known_maze.content[(current_position[0], current_position[1] - 1)].status != "0":
-        neighbors.append(MazeEntry(current_position[0], current_position[1] - 1, "1"))
-    if current_position[1] != known_maze.cols - 1 and known_maze.content[
-        (current_position[0], current_position[1] + 1)].status != "0":
-        neighbors.append(MazeEntry(current_position[0], current_position[1] + 1, "1"))
+    if current_position[0] != 0 and known_maze.get_status(current_position[0] - 1, current_position[1]) != "0":
+        neighbors.append(SearchNode(current_position[0] - 1, current_position[1]))
+    if current_position[0] != known_maze.rows - 1 and known_maze.get_status(
+            current_position[0] + 1, current_position[1]) != "0":
+        neighbors.append(SearchNode(current_position[0] + 1, current_position[1]))
+    if current_position[1] != 0 and known_maze.get_status(current_position[0], current_position[1] - 1) != "0":
+        neighbors.append(SearchNode(current_position[0], current_position[1] - 1))
+    if current_position[1] != known_maze.cols - 1 and known_maze.get_status(
+            current_position[0], current_position[1] + 1) != "0":
+        neighbors.append(SearchNode(current_position[0], current_position[1] + 1))
     return neighbors
 
 
@@ -577,78 +953,73 @@ def manhattan_distance_heuristic(current_position, goal_position):
     return x_distance + y_distance
 
 
-# Add a new node to the queue in order of increasing cost + heuristic
-def addToQueueFavorHighGValues(q, node):
-    j = len(q)
-    q_new = []
-    for i in range(len(q)):
-        nodeValue = node.cost + node.heuristic
-        entryValue = q[i].cost + q[i].heuristic
-        # Favor higher cost (g-value)
-        if nodeValue < entryValue or nodeValue == entryValue and node.cost > q[i].cost:
-            j = i
-            break
-    for i in range(0, j):
-        q_new.append(q[i])
-    q_new.append(node)
-    for i in range(j + 1, len(q) + 1):
-        q_new.append(q[i - 1])
-    return q_new
-
-
-# Add a new node to the queue in order of increasing cost + heuristic
-def addToQueueFavorLowGValues(q, node):
-    j = len(q)
-    q_new = []
-    for i in range(len(q)):
-        nodeValue = node.cost + node.heuristic
-        entryValue = q[i].cost + q[i].heuristic
-        # Favor lower cost (g-value)
-        if nodeValue < entryValue or nodeValue == entryValue and node.cost < q[i].cost:
-            j = i
-            break
-    for i in range(0, j):
-        q_new.append(q[i])
-    q_new.append(node)
-    for i in range(j + 1, len(q) + 1):
-        q_new.append(q[i - 1])
-    return q_new
+# Glyphs for a free space, a wall and a space on the path when rendering a maze with render_path:
+# the block characters of main.py, the digits of mainUpdated.py and the characters of pathIterationPrinting.py
+BLOCK_GLYPHS = "\u2591\u2588\u2592"
+DIGIT_GLYPHS = "10X"
+ASCII_GLYPHS = " #:"
+
+
+# RENDERS THE VISUAL PATH as one string, with one line per row of the maze
+# The statuses are laid out once in a bytearray with a newline after every row, the spaces on the path other than its
+# first and last are marked by index with "P", and the whole grid is then translated to glyphs at once
+# glyphs - the characters for a free space, a wall and a space on the path, BLOCK_GLYPHS by default
+def render_path(maze, path, glyphs=BLOCK_GLYPHS):
+    rows = maze.rows
+    cols = maze.cols
+    if isinstance(maze, CompactMaze):
+        statuses = bytes(maze.cells)
+    elif maze.content is not None:
+        content = maze.content
+        statuses = "".join([content[(row, col)].status for row in range(rows) for col in range(cols)]).encode()
+    else:
+        get_status_at = maze.get_status_at
+        statuses = "".join([get_status_at(index) for index in range(rows * cols)]).encode()
+    grid = bytearray(b"\n".join([statuses[start:start + cols] for start in range(0, rows * cols, cols)]))
+    for entry in path[1:-1]:
+        grid[entry.row * (cols + 1) + entry.col] = ord("P")
+    # Single-byte glyphs are translated without decoding the grid first
+    if max(glyphs) < "\u0100":
+        return grid.translate(bytes.maketrans(b"10P", glyphs.encode("latin-1"))).decode("latin-1")
+    # str.translate is slow for other glyphs, so each status is replaced in turn instead,
+    # unless a glyph is itself a status which is replaced after it
+    text = grid.decode()
+    if glyphs[0] in "0P" or glyphs[1] == "P":
+        return text.translate(str.maketrans("10P", glyphs))
+    return text.replace("1", glyphs[0]).replace("0", glyphs[1]).replace("P", glyphs[2])
 
 
 # PRINTS THE VISUAL PATH
 def printPath(maze, path):
-    row = []
-    for i in range(maze.rows):
-        strRow = ""
-        for j in range(maze.cols):
-            if (maze.content[(i, j)].status == "1"):
-                strRow += "\u2591"
-            if (maze.content[(i, j)].status == "0"):
-                strRow += "\u2588"
-            if (maze.content[(i, j)].status == "A"):
-                strRow += "A"
-            if (maze.content[(i, j)].status == "G"):
-                strRow += "G"
-        row.append(strRow)
-
-    xCoords = []
-    yCoords = []
-    for node in path[1:-1]:
-        temp = node.get()
-        x, y = map(int, temp.split(","))
-        xCoords.append(x)
-        yCoords.append(y)
-
-    for index, x in enumerate(xCoords):
-        row[x] = row[x][:yCoords[index]] + "\u2592" + row[x][yCoords[index] + 1:]
-
-    for i in row:
-        print(i)
+    print(render_path(maze, path))
+
+
+# The four walks compared by the benchmark below, along with the names used in its statistics
+WALKS = [("Forward Favoring High G Values", forward_a_star_walk_favor_high_g_values),
+         ("Forward Favoring Low G Values", forward_a_star_walk_favor_low_g_values),
+         ("Backward", backwards_a_star_walk),
+         ("Adaptive", adaptive_a_star_walk)]
+
+
+# Print the overall statistics of a benchmark run
+# total_expands, total_times - the total expanded cells and total time in seconds for each walk, in the order of walks
+# walks - the (name, walk) pairs which were run, WALKS by default
+# file - the file to print to (sys.stdout if None)
+def print_statistics(total_mazes, successes, total_expands, total_times, walks=WALKS, file=None):
+    print("\n\nSolved Mazes: " + str(successes), file=file)
+
+    print("\n\nOverall Statistics:", file=file)
+    for (name, walk), total_expand, total_time in zip(walks, total_expands, total_times):
+        print("Average Number of Expanded Cells per Maze for " + name + " = " + str(total_expand / total_mazes),
+              file=file)
+        print("Average Time per Maze for " + name + " = " + str(total_time / total_mazes) + " seconds", file=file)
 
 
 rows = 15
 cols = 30
 wallProbability = 0.25
+# Maze x of the benchmark below is generated from the seed maze_seed(master_seed, x)
+master_seed = 0
 
 # true_maze = Maze(rows, cols, wallProbability)
 # print("True Maze:")
@@ -665,75 +1036,72 @@ wallProbability = 0.25
 # print("\n\nVISUALIZED PATH:")
 # printPath(path_maze, path)
 
-mazes = []
-paths = []
-
-successes = 0
-total_mazes = 1000
-
-total_fhexpand = 0
-total_flexpand = 0
-total_bexpand = 0
-total_aexpand = 0
-
-total_fhtime = 0
-total_fltime = 0
-total_btime = 0
-total_atime = 0
-
-
-orig_stdout = sys.stdout
-with open("mazes.txt", "w") as f:
-    sys.stdout = f
-    for x in range(0, total_mazes):
-        true_maze = Maze(rows, cols, wallProbability)
-        print("\nMAZE " + str(x))
-        print("START: (" + str(true_maze.agent_row) + ", " + str(true_maze.agent_col) + ")")
-        print("GOAL: (" + str(true_maze.goal_row) + ", " + str(true_maze.goal_col) + ")\n")
-        fhstart_time = time.time()
-        fhsuccess, fhpath, fhexpand = forward_a_star_walk_favor_high_g_values(true_maze)
-        total_fhtime += time.time() - fhstart_time
-        total_fhexpand += fhexpand
-        flstart_time = time.time()
-        flsuccess, flpath, flexpand = forward_a_star_walk_favor_low_g_values(true_maze)
-        total_fltime += time.time() - flstart_time
-        total_flexpand += flexpand
-        bstart_time = time.time()
-        bsuccess, bpath, bexpand = backwards_a_star_walk(true_maze)
-        total_btime += time.time() - bstart_time
-        total_bexpand += bexpand
-        astart_time = time.time()
-        asuccess, apath, aexpand = adaptive_a_star_walk(true_maze)
-        total_atime += time.time() - astart_time
-        total_aexpand += aexpand
-        print("Was maze a success: " + str(fhsuccess))
-        print("\n(Forward Favoring High G Values)\n")
-        printPath(true_maze, fhpath)
-        print("\n(Forward Favoring Low G Values)\n")
-        printPath(true_maze, flpath)
-        print("\n(Backward)\n")
-        printPath(true_maze, bpath)
-        print("\n(Adaptive)\n")
-        printPath(true_maze, apath)
-        print("Forward Expanded Nodes (Favoring High G Values): " + str(fhexpand) +
-              " // Forward Expanded Nodes (Favoring Low G Values): " + str(flexpand) +
-              " \nBackward Expanded Nodes: " + str(bexpand) +
-              " // Adaptive Expanded Nodes: " + str(aexpand) + "\n--------")
-        if fhsuccess or flsuccess or bsuccess or asuccess:
-            successes += 1
-        mazes.append(true_maze)
-        paths.append(paths)
-
-    print("\n\nSolved Mazes: " + str(successes))
-
-    print("\n\nOverall Statistics:")
-    print("Average Number of Expanded Cells per Maze for Forward Favoring High G Values = " + str(total_fhexpand / total_mazes))
-    print("Average Time per Maze for Forward Favoring High G Values = " + str(total_fhtime / total_mazes) + " seconds")
-    print("Average Number of Expanded Cells per Maze for Forward Favoring Low G Values = " + str(total_flexpand / total_mazes))
-    print("Average Time per Maze for Forward Favoring Low G Values = " + str(total_fltime / total_mazes) + " seconds")
-    print("Average Number of Expanded Cells per Maze for Backward = " + str(total_bexpand / total_mazes))
-    print("Average Time per Maze for Backward = " + str(total_btime / total_mazes) + " seconds")
-    print("Average Number of Expanded Cells per Maze for Adaptive = " + str(total_aexpand / total_mazes))
-    print("Average Time per Maze for Adaptive = " + str(total_atime / total_mazes) + " seconds")
-
-    sys.stdout = orig_stdout
+# The text report of every report_every-th maze is written to mazes.txt (none if 0),
+# and a record of every maze, with the expanded cells and time of each walk, to mazes.jsonl
+report_every = 1
+
+if __name__ == "__main__":
+    successes = 0
+    total_mazes = 1000
+
+    total_fhexpand = 0
+    total_flexpand = 0
+    total_bexpand = 0
+    total_aexpand = 0
+
+    total_fhtime = 0
+    total_fltime = 0
+    total_btime = 0
+    total_atime = 0
+
+
+    with ReportWriter("mazes.txt", "mazes.jsonl", report_every) as report:
+        for x in range(0, total_mazes):
+            true_maze = Maze(rows, cols, wallProbability, seed=maze_seed(master_seed, x))
+            fhstart_time = time.time()
+            fhsuccess, fhpath, fhexpand = forward_a_star_walk_favor_high_g_values(true_maze)
+            fhtime = time.time() - fhstart_time
+            total_fhtime += fhtime
+            total_fhexpand += fhexpand
+            flstart_time = time.time()
+            flsuccess, flpath, flexpand = forward_a_star_walk_favor_low_g_values(true_maze)
+            fltime = time.time() - flstart_time
+            total_fltime += fltime
+            total_flexpand += flexpand
+            bstart_time = time.time()
+            bsuccess, bpath, bexpand = backwards_a_star_walk(true_maze)
+            btime = time.time() - bstart_time
+            total_btime += btime
+            total_bexpand += bexpand
+            astart_time = time.time()
+            asuccess, apath, aexpand = adaptive_a_star_walk(true_maze)
+            atime = time.time() - astart_time
+            total_atime += atime
+            total_aexpand += aexpand
+            if report.sampled(x):
+                report.write_maze(["", "MAZE " + str(x),
+                                   "SEED: " + maze_seed(master_seed, x),
+                                   "START: (" + str(true_maze.agent_row) + ", " + str(true_maze.agent_col) + ")",
+                                   "GOAL: (" + str(true_maze.goal_row) + ", " + str(true_maze.goal_col) + ")", "",
+                                   "Was maze a success: " + str(fhsuccess),
+                                   "", "(Forward Favoring High G Values)", "", render_path(true_maze, fhpath),
+                                   "", "(Forward Favoring Low G Values)", "", render_path(true_maze, flpath),
+                                   "", "(Backward)", "", render_path(true_maze, bpath),
+                                   "", "(Adaptive)", "", render_path(true_maze, apath),
+                                   "Forward Expanded Nodes (Favoring High G Values): " + str(fhexpand) +
+                                   " // Forward Expanded Nodes (Favoring Low G Values): " + str(flexpand) +
+                                   " \nBackward Expanded Nodes: " + str(bexpand) +
+                                   " // Adaptive Expanded Nodes: " + str(aexpand) + "\n--------"])
+            report.write_record({"maze": x, "seed": maze_seed(master_seed, x),
+                                 "agent_row": true_maze.agent_row, "agent_col": true_maze.agent_col,
+                                 "goal_row": true_maze.goal_row, "goal_col": true_maze.goal_col,
+                                 "success": fhsuccess,
+                                 "forward_high_g_expanded": fhexpand, "forward_high_g_seconds": fhtime,
+                                 "forward_low_g_expanded": flexpand, "forward_low_g_seconds": fltime,
+                                 "backward_expanded": bexpand, "backward_seconds": btime,
+                                 "adaptive_expanded": aexpand, "adaptive_seconds": atime})
+            if fhsuccess or flsuccess or bsuccess or asuccess:
+                successes += 1
+
+        print_statistics(total_mazes, successes, [total_fhexpand, total_flexpand, total_bexpand, total_aexpand],
+                         [total_fhtime, total_fltime, total_btime, total_atime], file=report.text)
@@ -1,5 +1,7 @@
 import random, sys, time
 
+from main import a_star_search, entries_from_path
+
 
 # "A" signifies the agent
 # "G" signifies the goal
@@ -33,31 +35,39 @@ class MazeEntry:
 # rows, cols - dimensions of the maze
 # agent_row, agent_col - starting coordinates for the agent
 # goal_row, goal_col - coordinates for the goal
+# seed - a seed or random.Random instance to generate the maze from (the global random module if None)
 class Maze:
-    def __init__(self, rows, cols, wallProbability, agent_row=None, agent_col=None, goal_row=None, goal_col=None):
+    def __init__(self, rows, cols, wallProbability, agent_row=None, agent_col=None, goal_row=None, goal_col=None,
+                 seed=None):
+        if seed is None:
+            rng = random
+        elif isinstance(seed, random.Random):
+            rng = seed
+        else:
+            rng = random.Random(seed)
         self.content = {}
         self.rows = rows
         self.cols = cols
         if agent_row is None:
-            self.agent_row = random.randint(0, rows - 1)
+            self.agent_row = rng.randint(0, rows - 1)
         else:
             self.agent_row = agent_row
         if agent_col is None:
-            self.agent_col = random.randint(0, cols - 1)
+            self.agent_col = rng.randint(0, cols - 1)
         else:
             self.agent_col = agent_col
         if goal_row is None:
-            self.goal_row = random.randint(0, rows - 1)
+            self.goal_row = rng.randint(0, rows - 1)
         else:
             self.goal_row = goal_row
         if goal_col is None:
-            self.goal_col = random.randint(0, cols - 1)
+            self.goal_col = rng.randint(0, cols - 1)
         else:
             self.goal_col = goal_col
         for i in range(rows):
             for j in range(cols):
                 if (i != self.agent_row or j != self.agent_col) and (i != self.goal_row or j != self.goal_col):
-                    randomNumber = random.random()
+                    randomNumber = rng.random()
                     if randomNumber > wallProbability:
                         wallStatus = "1"
                     else:
@@ -73,6 +83,9 @@ class Maze:
                 row.append(self.content[(i, j)].status)
             print(row)
 
+    def get_status(self, row, col):
+        return self.content[(row, col)].status
+
 
 # Navigate through the maze
 def forward_a_star_walk_favor_high_g_values(true_maze):
@@ -311,344 +324,54 @@ def update_adjacent_spaces(current_position, true_maze, known_maze):
 
 
 # Perform A* search on the known maze, beginning at initial_position, and targeting goal_position
+# with a_star_search from main.py, breaking ties in favor of higher cost (g-value),
+# and return the path as MazeEntry objects
 def forward_a_star_favor_high_g_values(initial_position, goal_position, known_maze):
-    # create the initial node in the tree based on the initial_position
-    initial_node = MazeEntry(initial_position[0], initial_position[1], "1", 0,
-                             manhattan_distance_heuristic(initial_position, goal_position))
-
-    # initialize the queue with only the initial_node
-    q = [initial_node]
-
-    # initialize the list of expanded nodes (implemented using a dictionary)
-    expandedList = {}
-
-    expanded = 0
-
-    # Iterate as long as the queue is not empty
-    while q:
-        # Pop the first node off of the queue
-        x = q[0]
-        q.remove(x)
-
-        # If this node has already been expanded, continue to the next iteration
-        if expandedList.setdefault((x.row, x.col)) is not None:
-            continue
-
-        # Add this node to the expanded list
-        expandedList[(x.row, x.col)] = True
-
-        expanded += 1
-
-        # If this node is the goal, return True, indicating success, as well as the path,
-        # Which is obtaining by following the parents of each node, up the tree
-        if x.row == goal_position[0] and x.col == goal_position[1]:
-            path = [x]
-            while x.parent is not None:
-                x = x.parent
-                path.append(x)
-            path.reverse()
-            # Passed - A Star Test (and thus findNeighbors is verified)
-            # print("Path From Forwards A Star:")
-            # for i in path:
-            #   i.print()
-            return True, path, expanded
-
-        # Find the neighbors of the current node, and for each neighbor, create a MazeEntry object to represent it,
-        # and add it to the queue in order of increasing cost + heuristic
-        for i in findNeighbors([x.row, x.col], known_maze):
-            if expandedList.setdefault((i.row, i.col)) is None:
-                i.parent = x
-                i.cost = x.cost + 1
-                i.heuristic = manhattan_distance_heuristic([i.row, i.col], goal_position)
-                q = addToQueueFavorHighGValues(q, i)
-
-    # If we exited from the while loop, meaning that the queue became empty without finding the goal,
-    # return false, indicating failure, and an empty list
-    return False, [], expanded
+    success, path, expanded = a_star_search(initial_position, goal_position, known_maze, favor_high_g=True)
+    return success, entries_from_path(path, known_maze.cols, MazeEntry), expanded
 
 
 # Perform A* search on the known maze, beginning at initial_position, and targeting goal_position
+# with a_star_search from main.py, breaking ties in favor of lower cost (g-value),
+# and return the path as MazeEntry objects
 def forward_a_star_favor_low_g_values(initial_position, goal_position, known_maze):
-    # create the initial node in the tree based on the initial_position
-    initial_node = MazeEntry(initial_position[0], initial_position[1], "1", 0,
-                             manhattan_distance_heuristic(initial_position, goal_position))
-
-    # initialize the queue with only the initial_node
-    q = [initial_node]
-
-    # initialize the list of expanded nodes (implemented using a dictionary)
-    expandedList = {}
-
-    expanded = 0
-
-    # Iterate as long as the queue is not empty
-    while q:
-        # Pop the first node off of the queue
-        x = q[0]
-        q.remove(x)
-
-        # If this node has already been expanded, continue to the next iteration
-        if expandedList.setdefault((x.row, x.col)) is not None:
-            continue
-
-        # Add this node to the expanded list
-        expandedList[(x.row, x.col)] = True
-
-        expanded += 1
-
-        # If this node is the goal, return True, indicating success, as well as the path,
-        # Which is obtaining by following the parents of each node, up the tree
-        if x.row == goal_position[0] and x.col == goal_position[1]:
-            path = [x]
-            while x.parent is not None:
-                x = x.parent
-                path.append(x)
-            path.reverse()
-            # Passed - A Star Test (and thus findNeighbors is verified)
-            # print("Path From Forwards A Star:")
-            # for i in path:
-            #   i.print()
-            return True, path, expanded
-
-        # Find the neighbors of the current node, and for each neighbor, create a MazeEntry object to represent it,
-        # and add it to the queue in order of increasing cost + heuristic
-        for i in findNeighbors([x.row, x.col], known_maze):
-            if expandedList.setdefault((i.row, i.col)) is None:
-                i.parent = x
-                i.cost = x.cost + 1
-                i.heuristic = manhattan_distance_heuristic([i.row, i.col], goal_position)
-                q = addToQueueFavorLowGValues(q, i)
-
-    # If we exited from the while loop, meaning that the queue became empty without finding the goal,
-    # return false, indicating failure, and an empty list
-    return False, [], expanded
+    success, path, expanded = a_star_search(initial_position, goal_position, known_maze, favor_high_g=False)
+    return success, entries_from_path(path, known_maze.cols, MazeEntry), expanded
 
 
-# Perform A* search on the known maze, beginning at initial_position, and targeting goal_position
+# Perform A* search on the known maze, beginning at initial_position, and targeting goal_position.
+# The Adaptive A* of this script stored its learned heuristics in the known_maze but never read them back, since the
+# neighbors of each node are new MazeEntry objects without a heuristic. It has always expanded the same cells as
+# forward_a_star_favor_high_g_values, which is the search it now runs
 def adaptive_a_star(initial_position, goal_position, known_maze):
-    # create the initial node in the tree based on the initial_position
-    initial_node = MazeEntry(initial_position[0], initial_position[1], "1", 0,
-                             manhattan_distance_heuristic(initial_position, goal_position))
-
-    # initialize the queue with only the initial_node
-    q = [initial_node]
-
-    # initialize the list of expanded nodes (implemented using a dictionary)
-    expandedList = {}
-
-    expanded = 0
-
-    # Iterate as long as the queue is not empty
-    while q:
-        # Pop the first node off of the queue
-        x = q[0]
-        q.remove(x)
-
-        # If this node has already been expanded, continue to the next iteration
-        if expandedList.setdefault((x.row, x.col)) is not None:
-            continue
-
-        # Add this node to the expanded list
-        expandedList[(x.row, x.col)] = True
-
-        expanded += 1
-
-        # If this node is the goal, return True, indicating success, as well as the path,
-        # Which is obtaining by following the parents of each node, up the tree
-        if x.row == goal_position[0] and x.col == goal_position[1]:
-            path = [x]
-            while x.parent is not None:
-                x = x.parent
-                path.append(x)
-            path.reverse()
-            # Update Every Expanded Node According to Adaptive A* Search
-            # By Overwriting It With an Identical Node But With Heuristic Defined as goal_cost - cost
-            # (In Accordance With Adaptive A* Heuristic Update Equation)
-            for i in expandedList:
-                status = known_maze.content[(i[0], i[1])].status
-                cost = known_maze.content[(i[0], i[1])].cost
-                if cost is None:
-                    cost = 0
-                goal_cost = len(path) - 1
-                known_maze.content[(i[0], i[1])] = MazeEntry(i[0], i[1], status, cost, goal_cost - cost)
-            # Passed - A Star Test (and thus findNeighbors is verified)
-            # print("Path From Forwards A Star:")
-            # for i in path:
-            #   i.print()
-            return True, path, expanded
-
-        # Find the neighbors of the current node, and for each neighbor, create a MazeEntry object to represent it,
-        # and add it to the queue in order of increasing cost + heuristic
-        for i in findNeighbors([x.row, x.col], known_maze):
-            if expandedList.setdefault((i.row, i.col)) is None:
-                i.parent = x
-                i.cost = x.cost + 1
-                if i.heuristic is None:
-                    i.heuristic = manhattan_distance_heuristic([i.row, i.col], goal_position)
-                q = addToQueueFavorHighGValues(q, i)
-
-    # If we exited from the while loop, meaning that the queue became empty without finding the goal,
-    # return false, indicating failure, and an empty list
-    return False, [], expanded
+    return forward_a_star_favor_high_g_values(initial_position, goal_position, known_maze)
 
 
+# Perform A* search on the known maze, beginning at goal_position, and targeting initial_position
+# with a_star_search from main.py, breaking ties in favor of higher cost (g-value),
+# and return the path as MazeEntry objects
 def backwards_a_star(initial_position, goal_position, known_maze):
-    # create the initial node in the tree based on the initial_position
-    initial_node = MazeEntry(goal_position[0], goal_position[1], "1", 0,
-                             manhattan_distance_heuristic(goal_position, initial_position))
-
-    # initialize the queue with only the initial_node
-    q = [initial_node]
-
-    # initialize the list of expanded nodes (implemented using a dictionary)
-    expandedList = {}
-
-    expanded = 0
-
-    # Iterate as long as the queue is not empty
-    while q:
-        # Pop the first node off of the queue
-        x = q[0]
-        q.remove(x)
-
-        # If this node has already been expanded, continue to the next iteration
-        if expandedList.setdefault((x.row, x.col)) is not None:
-            continue
-
-        # Add this node to the expanded list
-        expandedList[(x.row, x.col)] = True
-        expanded += 1
-
-        # If this node is the goal, return True, indicating success, as well as the path,
-        # Which is obtaining by following the parents of each node, up the tree
-        if x.row == initial_position[0] and x.col == initial_position[1]:
-            path = [x]
-            while x.parent is not None:
-                x = x.parent
-                path.append(x)
-            path.reverse()
-            # Passed - A Star Test (and thus findNeighbors is verified)
-            # print("Path From Backwards A Star:")
-            # for i in path:
-            #   i.print()
-            return True, path, expanded
-
-        # Find the neighbors of the current node, and for each neighbor, create a MazeEntry object to represent it,
-        # and add it to the queue in order of increasing cost + heuristic
-        for i in findNeighbors([x.row, x.col], known_maze):
-            if expandedList.setdefault((i.row, i.col)) is None:
-                i.parent = x
-                i.cost = x.cost + 1
-                i.heuristic = manhattan_distance_heuristic([i.row, i.col], initial_position)
-                q = addToQueueFavorHighGValues(q, i)
-
-    # If we exited from the while loop, meaning that the queue became empty without finding the goal,
-    # return false, indicating failure, and an empty list
-    return False, [], expanded
-
-
-# Find all neighbors of a node based on its current position and the content of the known maze
-# Any neighbors which contain a wall are ignored
-def findNeighbors(current_position, known_maze):
-    neighbors = []
-    if current_position[0] != 0 and known_maze.content[(current_position[0] - 1, current_position[1])].status != "0":
-        neighbors.append(MazeEntry(current_position[0] - 1, current_position[1], "1"))
-    if current_position[0] != known_maze.rows - 1 and known_maze.content[
-        (current_position[0] + 1, current_position[1])].status != "0":
-        neighbors.append(MazeEntry(current_position[0] + 1, current_position[1], "1"))
-    if current_position[1] != 0 and known_maze.content[(current_position[0], current_position[1] - 1)].status != "0":
-        neighbors.append(MazeEntry(current_position[0], current_position[1] - 1, "1"))
-    if current_position[1] != known_maze.cols - 1 and known_maze.content[
-        (current_position[0], current_position[1] + 1)].status != "0":
-        neighbors.append(MazeEntry(current_position[0], current_position[1] + 1, "1"))
-    return neighbors
-
-
-# Compute the Manhattan distance heuristic for a node based on its position and the goal position
-def manhattan_distance_heuristic(current_position, goal_position):
-    if current_position[0] > goal_position[0]:
-        x_distance = current_position[0] - goal_position[0]
-    else:
-        x_distance = goal_position[0] - current_position[0]
-    if current_position[1] > goal_position[1]:
-        y_distance = current_position[1] - goal_position[1]
-    else:
-        y_distance = goal_position[1] - current_position[1]
-    return x_distance + y_distance
-
-
-# Add a new node to the queue in order of increasing cost + heuristic
-def addToQueueFavorHighGValues(q, node):
-    j = len(q)
-    q_new = []
-    for i in range(len(q)):
-        nodeValue = node.cost + node.heuristic
-        entryValue = q[i].cost + q[i].heuristic
-        # Favor higher cost (g-value)
-        if nodeValue < entryValue or nodeValue == entryValue and node.cost > q[i].cost:
-            j = i
-            break
-    for i in range(0, j):
-        q_new.append(q[i])
-    q_new.append(node)
-    for i in range(j + 1, len(q) + 1):
-        q_new.append(q[i - 1])
-    return q_new
-
-
-# Add a new node to the queue in order of increasing cost + heuristic
-def addToQueueFavorLowGValues(q, node):
-    j = len(q)
-    q_new = []
-    for i in range(len(q)):
-        nodeValue = node.cost + node.heuristic
-        entryValue = q[i].cost + q[i].heuristic
-        # Favor lower cost (g-value)
-        if nodeValue < entryValue or nodeValue == entryValue and node.cost < q[i].cost:
-            j = i
-            break
-    for i in range(0, j):
-        q_new.append(q[i])
-    q_new.append(node)
-    for i in range(j + 1, len(q) + 1):
-        q_new.append(q[i - 1])
-    return q_new
+    success, path, expanded = a_star_search(initial_position, goal_position, known_maze, backward=True)
+    return success, entries_from_path(path, known_maze.cols, MazeEntry), expanded
 
 
 # PRINTS THE VISUAL PATH
+# The statuses are laid out once in a bytearray with a newline after every row, the spaces on the path other than its
+# first and last are marked by index, and the whole grid is printed at once
 def printPath(maze, path):
-    row = []
-    for i in range(maze.rows):
-        strRow = ""
-        for j in range(maze.cols):
-            if (maze.content[(i, j)].status == "1"):
-                strRow += "1"
-            if (maze.content[(i, j)].status == "0"):
-                strRow += "0"
-            if (maze.content[(i, j)].status == "A"):
-                strRow += "A"
-            if (maze.content[(i, j)].status == "G"):
-                strRow += "G"
-        row.append(strRow)
-
-    xCoords = []
-    yCoords = []
+    cols = maze.cols
+    grid = bytearray("\n".join(["".join([maze.content[(i, j)].status for j in range(cols)])
+                                for i in range(maze.rows)]).encode())
     for node in path[1:-1]:
-        temp = node.get()
-        x, y = map(int, temp.split(","))
-        xCoords.append(x)
-        yCoords.append(y)
-
-    for index, x in enumerate(xCoords):
-        row[x] = row[x][:yCoords[index]] + "X" + row[x][yCoords[index] + 1:]
-
-    for i in row:
-        print(i)
+        grid[node.row * (cols + 1) + node.col] = ord("X")
+    print(grid.decode())
 
 
 rows = 15
 cols = 30
 wallProbability = 0.25
+# Maze x is generated from the seed str(master_seed) + ":" + str(x), so any maze can be regenerated on its own
+master_seed = 0
 
 # true_maze = Maze(rows, cols, wallProbability)
 # print("True Maze:")
@@ -665,75 +388,77 @@ wallProbability = 0.25
 # print("\n\nVISUALIZED PATH:")
 # printPath(path_maze, path)
 
-mazes = []
-paths = []
-
-successes = 0
-total_mazes = 1000
-
-total_fhexpand = 0
-total_flexpand = 0
-total_bexpand = 0
-total_aexpand = 0
-
-total_fhtime = 0
-total_fltime = 0
-total_btime = 0
-total_atime = 0
-
-
-orig_stdout = sys.stdout
-with open("mazes.txt", "w") as f:
-    sys.stdout = f
-    for x in range(0, total_mazes):
-        true_maze = Maze(rows, cols, wallProbability)
-        print("\nMAZE " + str(x))
-        print("START: (" + str(true_maze.agent_row) + ", " + str(true_maze.agent_col) + ")")
-        print("GOAL: (" + str(true_maze.goal_row) + ", " + str(true_maze.goal_col) + ")\n")
-        fhstart_time = time.time()
-        fhsuccess, fhpath, fhexpand = forward_a_star_walk_favor_high_g_values(true_maze)
-        total_fhtime += time.time() - fhstart_time
-        total_fhexpand += fhexpand
-        flstart_time = time.time()
-        flsuccess, flpath, flexpand = forward_a_star_walk_favor_low_g_values(true_maze)
-        total_fltime += time.time() - flstart_time
-        total_flexpand += flexpand
-        bstart_time = time.time()
-        bsuccess, bpath, bexpand = backwards_a_star_walk(true_maze)
-        total_btime += time.time() - bstart_time
-        total_bexpand += bexpand
-        astart_time = time.time()
-        asuccess, apath, aexpand = adaptive_a_star_walk(true_maze)
-        total_atime += time.time() - astart_time
-        total_aexpand += aexpand
-        print("Was maze a success: " + str(fhsuccess))
-        print("\n(Forward Favoring High G Values)\n")
-        printPath(true_maze, fhpath)
-        print("\n(Forward Favoring Low G Values)\n")
-        printPath(true_maze, flpath)
-        print("\n(Backward)\n")
-        printPath(true_maze, bpath)
-        print("\n(Adaptive)\n")
-        printPath(true_maze, apath)
-        print("Forward Expanded Nodes (Favoring High G Values): " + str(fhexpand) +
-              " // Forward Expanded Nodes (Favoring Low G Values): " + str(flexpand) +
-              " // Backward Expanded Nodes: " + str(bexpand) +
-              " // Adaptive Expanded Nodes: " + str(aexpand) + "\n--------")
-        if fhsuccess or flsuccess or bsuccess or asuccess:
-            successes += 1
-        mazes.append(true_maze)
-        paths.append(paths)
-
-    print("\n\nSolved Mazes: " + str(successes))
-
-    print("\n\nOverall Statistics:")
-    print("Average Number of Expanded Cells per Maze for Forward Favoring High G Values = " + str(total_fhexpand / total_mazes))
-    print("Average Time per Maze for Forward Favoring High G Values = " + str(total_fhtime / total_mazes) + " seconds")
-    print("Average Number of Expanded Cells per Maze for Forward Favoring Low G Values = " + str(total_flexpand / total_mazes))
-    print("Average Time per Maze for Forward Favoring Low G Values = " + str(total_fltime / total_mazes) + " seconds")
-    print("Average Number of Expanded Cells per Maze for Backward = " + str(total_bexpand / total_mazes))
-    print("Average Time per Maze for Backward = " + str(total_btime / total_mazes) + " seconds")
-    print("Average Number of Expanded Cells per Maze for Adaptive = " + str(total_aexpand / total_mazes))
-    print("Average Time per Maze for Adaptive = " + str(total_atime / total_mazes) + " seconds")
-
-    sys.stdout = orig_stdout
\ No newline at end of file
+if __name__ == "__main__":
+    mazes = []
+    paths = []
+
+    successes = 0
+    total_mazes = 1000
+
+    total_fhexpand = 0
+    total_flexpand = 0
+    total_bexpand = 0
+    total_aexpand = 0
+
+    total_fhtime = 0
+    total_fltime = 0
+    total_btime = 0
+    total_atime = 0
+
+
+    orig_stdout = sys.stdout
+    with open("mazes.txt", "w") as f:
+        sys.stdout = f
+        for x in range(0, total_mazes):
+            true_maze = Maze(rows, cols, wallProbability, seed=str(master_seed) + ":" + str(x))
+            print("\nMAZE " + str(x))
+            print("SEED: " + str(master_seed) + ":" + str(x))
+            print("START: (" + str(true_maze.agent_row) + ", " + str(true_maze.agent_col) + ")")
+            print("GOAL: (" + str(true_maze.goal_row) + ", " + str(true_maze.goal_col) + ")\n")
+            fhstart_time = time.time()
+            fhsuccess, fhpath, fhexpand = forward_a_star_walk_favor_high_g_values(true_maze)
+            total_fhtime += time.time() - fhstart_time
+            total_fhexpand += fhexpand
+            flstart_time = time.time()
+            flsuccess, flpath, flexpand = forward_a_star_walk_favor_low_g_values(true_maze)
+            total_fltime += time.time() - flstart_time
+            total_flexpand += flexpand
+            bstart_time = time.time()
+            bsuccess, bpath, bexpand = backwards_a_star_walk(true_maze)
+            total_btime += time.time() - bstart_time
+            total_bexpand += bexpand
+            astart_time = time.time()
+            asuccess, apath, aexpand = adaptive_a_star_walk(true_maze)
+            total_atime += time.time() - astart_time
+            total_aexpand += aexpand
+            print("Was maze a success: " + str(fhsuccess))
+            print("\n(Forward Favoring High G Values)\n")
+            printPath(true_maze, fhpath)
+            print("\n(Forward Favoring Low G Values)\n")
+            printPath(true_maze, flpath)
+            print("\n(Backward)\n")
+            printPath(true_maze, bpath)
+            print("\n(Adaptive)\n")
+            printPath(true_maze, apath)
+            print("Forward Expanded Nodes (Favoring High G Values): " + str(fhexpand) +
+                  " // Forward Expanded Nodes (Favoring Low G Values): " + str(flexpand) +
+                  " // Backward Expanded Nodes: " + str(bexpand) +
+                  " // Adaptive Expanded Nodes: " + str(aexpand) + "\n--------")
+            if fhsuccess or flsuccess or bsuccess or asuccess:
+                successes += 1
+            mazes.append(true_maze)
+            paths.append(paths)
+
+        print("\n\nSolved Mazes: " + str(successes))
+
+        print("\n\nOverall Statistics:")
+        print("Average Number of Expanded Cells per Maze for Forward Favoring High G Values = " + str(total_fhexpand / total_mazes))
+        print("Average Time per Maze for Forward Favoring High G Values = " + str(total_fhtime / total_mazes) + " seconds")
+        print("Average Number of Expanded Cells per Maze for Forward Favoring Low G Values = " + str(total_flexpand / total_mazes))
+        print("Average Time per Maze for Forward Favoring Low G Values = " + str(total_fltime / total_mazes) + " seconds")
+        print("Average Number of Expanded Cells per Maze for Backward = " + str(total_bexpand / total_mazes))
+        print("Average Time per Maze for Backward = " + str(total_btime / total_mazes) + " seconds")
+        print("Average Number of Expanded Cells per Maze for Adaptive = " + str(total_aexpand / total_mazes))
+        print("Average Time per Maze for Adaptive = " + str(total_atime / total_mazes) + " seconds")
+
+        sys.stdout = orig_stdout
\ No newline at end of file
@@ -0,0 +1,151 @@
+import mmap, struct, sys
+
+from main import CompactMaze, Maze, wallProbability
+
+
+# Binary maze files, which are memory-mapped when opened so that a maze can be generated once and reused by many runs
+# without loading it into Python objects.
+# A maze file consists of a header, the seed the maze was generated from, and then the cells, starting at the next
+# multiple of 8 bytes. The cells are stored in one of two layouts:
+# 8 bits per space - the status of the space at (row, col) as one ASCII byte at row * cols + col, as in CompactMaze
+# 1 bit per space - each row padded to a whole number of bytes, with bit col % 8 of byte col // 8 of the row set
+#                   if (row, col) is a wall, as in BitMaze. The agent and goal are only stored in the header
+
+MAGIC = b"MAZE"
+VERSION = 1
+
+# magic, version, bits per space, rows, cols, agent_row, agent_col, goal_row, goal_col, length of the seed in bytes
+HEADER = struct.Struct("<4sHHIIIIIII")
+
+
+# BitMaze Class - a Maze which stores one bit per space, set if the space is a wall
+# cells - any bytes-like object in the 1-bit layout described above, e.g. a bytearray or a memory-mapped file
+# row_bytes - the number of bytes used by each row of cells
+# Setting the agent or goal to any status leaves them as "A" or "G", since their positions are not stored in the cells
+class BitMaze(Maze):
+    def __init__(self, rows, cols, agent_row, agent_col, goal_row, goal_col, cells):
+        self.rows = rows
+        self.cols = cols
+        self.agent_row = agent_row
+        self.agent_col = agent_col
+        self.goal_row = goal_row
+        self.goal_col = goal_col
+        self.content = None
+        self.cells = cells
+        self.row_bytes = (cols + 7) // 8
+
+    def get_status(self, row, col):
+        return self.get_status_at(row * self.cols + col)
+
+    def set_status(self, row, col, status):
+        self.set_status_at(row * self.cols + col, status)
+
+    def get_status_at(self, index):
+        row, col = divmod(index, self.cols)
+        if row == self.goal_row and col == self.goal_col:
+            return "G"
+        if row == self.agent_row and col == self.agent_col:
+            return "A"
+        if self.cells[row * self.row_bytes + (col >> 3)] >> (col & 7) & 1:
+            return "0"
+        return "1"
+
+    def set_status_at(self, index, status):
+        row, col = divmod(index, self.cols)
+        byte = row * self.row_bytes + (col >> 3)
+        if status == "0":
+            self.cells[byte] |= 1 << (col & 7)
+        else:
+            self.cells[byte] &= ~(1 << (col & 7))
+
+    def wall_mask(self, row):
+        return int.from_bytes(self.cells[row * self.row_bytes:(row + 1) * self.row_bytes], "little")
+
+
+# Return the offset of the cells in a maze file whose seed is seed_length bytes long
+def cells_offset(seed_length):
+    return (HEADER.size + seed_length + 7) // 8 * 8
+
+
+# Write any kind of Maze to a maze file at path
+# seed - the seed the maze was generated from, if it should be recorded (e.g. as returned by main.maze_seed)
+# packed - store 1 bit per space instead of 1 byte, which is 8 times smaller but slower to read
+def save_maze(maze, path, seed=None, packed=False):
+    if seed is None:
+        seed_bytes = b""
+    else:
+        seed_bytes = str(seed).encode()
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 1 if packed else 8, maze.rows, maze.cols, maze.agent_row, maze.agent_col,
+                            maze.goal_row, maze.goal_col, len(seed_bytes)))
+        f.write(seed_bytes)
+        f.write(bytes(cells_offset(len(seed_bytes)) - HEADER.size - len(seed_bytes)))
+        if packed:
+            row_bytes = (maze.cols + 7) // 8
+            for row in range(maze.rows):
+                f.write(maze.wall_mask(row).to_bytes(row_bytes, "little"))
+        elif isinstance(maze, CompactMaze):
+            f.write(maze.cells)
+        else:
+            for row in range(maze.rows):
+                f.write("".join([maze.get_status(row, col) for col in range(maze.cols)]).encode())
+
+
+# MazeFile Class - a maze file, mapped into memory
+# The maze is read straight from the mapping whenever one of its spaces is read, so opening a file takes O(1) time
+# and only the pages of the file which are actually read are loaded. Close the file, or use it in a with statement,
+# once the maze is no longer used.
+# maze - the maze stored in the file, a CompactMaze for 1-byte cells or a BitMaze for 1-bit cells, which can be passed
+#        to any walk as the true maze
+# seed - the seed the maze was generated from as a string, or None if it was not recorded
+# writable - map the file for writing, so that changes made to the maze through set_status are saved to the file
+class MazeFile:
+    def __init__(self, path, writable=False):
+        with open(path, "r+b" if writable else "rb") as f:
+            self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        if len(self.mapping) < HEADER.size:
+            self.mapping.close()
+            raise ValueError(str(path) + " is not a maze file")
+        magic, version, bits, rows, cols, agent_row, agent_col, goal_row, goal_col, seed_length = \
+            HEADER.unpack_from(self.mapping)
+        if magic != MAGIC or version != VERSION or bits not in (1, 8):
+            self.mapping.close()
+            raise ValueError(str(path) + " is not a version " + str(VERSION) + " maze file")
+        offset = cells_offset(seed_length)
+        if bits == 8:
+            size = rows * cols
+        else:
+            size = rows * ((cols + 7) // 8)
+        if len(self.mapping) < offset + size:
+            self.mapping.close()
+            raise ValueError(str(path) + " is truncated")
+        if seed_length:
+            self.seed = self.mapping[HEADER.size:HEADER.size + seed_length].decode()
+        else:
+            self.seed = None
+        self.cells = memoryview(self.mapping)[offset:offset + size]
+        if bits == 8:
+            self.maze = CompactMaze(rows, cols, None, agent_row, agent_col, goal_row, goal_col, cells=self.cells)
+        else:
+            self.maze = BitMaze(rows, cols, agent_row, agent_col, goal_row, goal_col, self.cells)
+
+    def close(self):
+        self.cells.release()
+        self.mapping.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Generate a maze once and save it, e.g. "python mazeFile.py maze.bin 1001 1001 0 packed"
+# Arguments: path, rows, cols, then optionally the seed (0 by default) and "packed" for 1 bit per space
+if __name__ == "__main__":
+    path = sys.argv[1]
+    rows = int(sys.argv[2])
+    cols = int(sys.argv[3])
+    seed = sys.argv[4] if len(sys.argv) > 4 else "0"
+    save_maze(CompactMaze(rows, cols, wallProbability, seed=seed), path, seed=seed,
+              packed=len(sys.argv) > 5 and sys.argv[5] == "packed")
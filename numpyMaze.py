@@ -0,0 +1,38 @@
+import random
+
+from main import CompactMaze
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Generate a CompactMaze by drawing the whole wall mask at once with a seeded NumPy Generator,
+# instead of calling random.random() once per space as Maze.__init__ does.
+# wallProbability has the same meaning as for Maze: each space other than the agent and goal is a wall
+# with probability wallProbability. The agent and goal are placed at random unless their coordinates are given.
+# seed - anything accepted by numpy.random.default_rng, including an existing Generator,
+#        a random.Random instance, from which a 64-bit seed is drawn, or a string such as main.maze_seed returns
+def generate_numpy_maze(rows, cols, wallProbability, seed=None, agent_row=None, agent_col=None, goal_row=None,
+                        goal_col=None):
+    if numpy is None:
+        raise ImportError("generate_numpy_maze requires NumPy")
+    if isinstance(seed, str):
+        seed = random.Random(seed)
+    if isinstance(seed, random.Random):
+        seed = seed.getrandbits(64)
+    rng = numpy.random.default_rng(seed)
+    if agent_row is None:
+        agent_row = int(rng.integers(rows))
+    if agent_col is None:
+        agent_col = int(rng.integers(cols))
+    if goal_row is None:
+        goal_row = int(rng.integers(rows))
+    if goal_col is None:
+        goal_col = int(rng.integers(cols))
+    cells = numpy.where(rng.random(rows * cols) > wallProbability, ord("1"), ord("0")).astype(numpy.uint8)
+    cells[agent_row * cols + agent_col] = ord("A")
+    cells[goal_row * cols + goal_col] = ord("G")
+    return CompactMaze(rows, cols, wallProbability, agent_row, agent_col, goal_row, goal_col,
+                       cells=bytearray(cells.tobytes()))
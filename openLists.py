@@ -0,0 +1,179 @@
+import heapq
+from collections import deque
+
+
+# Open lists (priority queues) used by the A* searches in main.py.
+# Every open list orders nodes by increasing cost + heuristic (f-value) and breaks ties between equal
+# f-values either in favor of higher cost (g-value) or in favor of lower cost (g-value), or, if favor_high_g is None,
+# first in first out without regard to cost, as the sorted lists of astarExpand.py, astarPath.py and
+# backwardsAstar.py do.
+# Nodes with identical f and g values are popped in the order they were added.
+# Each open list supports push(node), pop() and len(), and is truthy while it still contains nodes.
+
+
+# BinaryHeapQueue - open list backed by a binary heap, O(log n) per push and per pop
+# heap - list of (f-value, tie-break on g-value, insertion counter, node) entries
+# favor_high_g - whether ties between equal f-values are broken in favor of higher g-values (or neither if None)
+# counter - number of nodes pushed so far, used to keep equal entries in insertion order
+class BinaryHeapQueue:
+    def __init__(self, favor_high_g=True):
+        self.heap = []
+        self.favor_high_g = favor_high_g
+        self.counter = 0
+
+    def push(self, node):
+        if self.favor_high_g:
+            tie_break = -node.cost
+        elif self.favor_high_g is None:
+            tie_break = 0
+        else:
+            tie_break = node.cost
+        heapq.heappush(self.heap, (node.cost + node.heuristic, tie_break, self.counter, node))
+        self.counter += 1
+
+    def pop(self):
+        return heapq.heappop(self.heap)[3]
+
+    def __len__(self):
+        return len(self.heap)
+
+
+# BucketQueue - open list organised as an array of buckets indexed by f-value, O(1) amortised per push and per pop
+# Requires integer f-values, which holds for the unit-cost grids and Manhattan distance heuristic in main.py.
+# Each f bucket is itself split into FIFO sub-buckets indexed by g-value, so the tie-break on g-values is exact.
+# Without a tie-break on g-values, every node of an f bucket goes to its first sub-bucket instead.
+# buckets - buckets[f][g] is a deque of the nodes with that f-value and g-value
+# counts - counts[f] is the number of nodes in buckets[f]
+# best_g - best_g[f] is the g-value of the sub-bucket of buckets[f] to pop from next
+# favor_high_g - whether ties between equal f-values are broken in favor of higher g-values (or neither if None)
+# min_f - the lowest f-value which may contain nodes
+# size - number of nodes in the queue
+class BucketQueue:
+    def __init__(self, favor_high_g=True):
+        self.buckets = []
+        self.counts = []
+        self.best_g = []
+        self.favor_high_g = favor_high_g
+        self.min_f = 0
+        self.size = 0
+
+    def push(self, node):
+        f = node.cost + node.heuristic
+        g = 0 if self.favor_high_g is None else node.cost
+        while len(self.buckets) <= f:
+            self.buckets.append([])
+            self.counts.append(0)
+            self.best_g.append(-1)
+        bucket = self.buckets[f]
+        while len(bucket) <= g:
+            bucket.append(deque())
+        bucket[g].append(node)
+        if self.counts[f] == 0 or (g > self.best_g[f] if self.favor_high_g else g < self.best_g[f]):
+            self.best_g[f] = g
+        self.counts[f] += 1
+        if self.size == 0 or f < self.min_f:
+            self.min_f = f
+        self.size += 1
+
+    def pop(self):
+        while self.counts[self.min_f] == 0:
+            self.min_f += 1
+        f = self.min_f
+        bucket = self.buckets[f]
+        g = self.best_g[f]
+        if self.favor_high_g:
+            while not bucket[g]:
+                g -= 1
+        else:
+            while not bucket[g]:
+                g += 1
+        self.best_g[f] = g
+        self.counts[f] -= 1
+        self.size -= 1
+        return bucket[g].popleft()
+
+    def __len__(self):
+        return self.size
+
+
+# LinearQueue - the original sorted-list open list, O(n) per push and per pop
+# Kept as a reference implementation for benchmarking and regression checks
+# q - list of nodes, sorted in the order they will be popped
+# favor_high_g - whether ties between equal f-values are broken in favor of higher g-values (or neither if None)
+class LinearQueue:
+    def __init__(self, favor_high_g=True):
+        self.q = []
+        self.favor_high_g = favor_high_g
+
+    def push(self, node):
+        if self.favor_high_g:
+            self.q = addToQueueFavorHighGValues(self.q, node)
+        elif self.favor_high_g is None:
+            self.q = addToQueueFirstInFirstOut(self.q, node)
+        else:
+            self.q = addToQueueFavorLowGValues(self.q, node)
+
+    def pop(self):
+        x = self.q[0]
+        self.q.remove(x)
+        return x
+
+    def __len__(self):
+        return len(self.q)
+
+
+# Add a new node to the queue in order of increasing cost + heuristic
+def addToQueueFavorHighGValues(q, node):
+    j = len(q)
+    q_new = []
+    for i in range(len(q)):
+        nodeValue = node.cost + node.heuristic
+        entryValue = q[i].cost + q[i].heuristic
+        # Favor higher cost (g-value)
+        if nodeValue < entryValue or nodeValue == entryValue and node.cost > q[i].cost:
+            j = i
+            break
+    for i in range(0, j):
+        q_new.append(q[i])
+    q_new.append(node)
+    for i in range(j + 1, len(q) + 1):
+        q_new.append(q[i - 1])
+    return q_new
+
+
+# Add a new node to the queue in order of increasing cost + heuristic
+def addToQueueFavorLowGValues(q, node):
+    j = len(q)
+    q_new = []
+    for i in range(len(q)):
+        nodeValue = node.cost + node.heuristic
+        entryValue = q[i].cost + q[i].heuristic
+        # Favor lower cost (g-value)
+        if nodeValue < entryValue or nodeValue == entryValue and node.cost < q[i].cost:
+            j = i
+            break
+    for i in range(0, j):
+        q_new.append(q[i])
+    q_new.append(node)
+    for i in range(j + 1, len(q) + 1):
+        q_new.append(q[i - 1])
+    return q_new
+
+
+# Add a new node to the queue in order of increasing cost + heuristic
+def addToQueueFirstInFirstOut(q, node):
+    j = len(q)
+    q_new = []
+    for i in range(len(q)):
+        nodeValue = node.cost + node.heuristic
+        entryValue = q[i].cost + q[i].heuristic
+        # Ignore cost (g-value), so that nodes with equal cost + heuristic are popped in the order they were added
+        if nodeValue < entryValue:
+            j = i
+            break
+    for i in range(0, j):
+        q_new.append(q[i])
+    q_new.append(node)
+    for i in range(j + 1, len(q) + 1):
+        q_new.append(q[i - 1])
+    return q_new
@@ -0,0 +1,64 @@
+import os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+
+import main
+from main import Maze, WALKS, maze_seed, print_statistics
+
+
+# Parallel version of the benchmark at the bottom of main.py.
+# Mazes are sharded across a pool of worker processes. Each worker regenerates its mazes from a per-maze seed
+# derived from the master seed, so the mazes, expanded cell counts and solved mazes do not depend on
+# the number of workers.
+# Usage: python parallelBenchmark.py [total_mazes] [workers] [master_seed]
+
+
+# Generate a single maze from its seed and run every walk over it.
+# Return whether any walk succeeded, along with the expanded cells and time taken by each walk
+def run_maze(maze_number, master_seed, rows, cols, wallProbability):
+    true_maze = Maze(rows, cols, wallProbability, seed=maze_seed(master_seed, maze_number))
+    success = False
+    expands = []
+    times = []
+    for name, walk in WALKS:
+        start_time = time.time()
+        result = walk(true_maze)
+        times.append(time.time() - start_time)
+        expands.append(result[2])
+        success = success or result[0]
+    return success, expands, times
+
+
+# Run the benchmark over total_mazes mazes using the given number of worker processes,
+# then print the same overall statistics as main.py
+def run_parallel(total_mazes, workers, master_seed, rows=main.rows, cols=main.cols,
+                 wallProbability=main.wallProbability):
+    successes = 0
+    total_expands = [0] * len(WALKS)
+    total_times = [0] * len(WALKS)
+    maze_numbers = range(total_mazes)
+    with ProcessPoolExecutor(workers) as executor:
+        results = executor.map(run_maze, maze_numbers, [master_seed] * total_mazes, [rows] * total_mazes,
+                               [cols] * total_mazes, [wallProbability] * total_mazes,
+                               chunksize=max(1, total_mazes // (workers * 4)))
+        for success, expands, times in results:
+            if success:
+                successes += 1
+            for i in range(len(WALKS)):
+                total_expands[i] += expands[i]
+                total_times[i] += times[i]
+    print_statistics(total_mazes, successes, total_expands, total_times)
+
+
+if __name__ == "__main__":
+    total_mazes = 1000
+    workers = os.cpu_count()
+    master_seed = main.master_seed
+    if len(sys.argv) > 1:
+        total_mazes = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        workers = int(sys.argv[2])
+    if len(sys.argv) > 3:
+        master_seed = int(sys.argv[3])
+    start_time = time.time()
+    run_parallel(total_mazes, workers, master_seed)
+    print("\nWall Clock Time = " + str(time.time() - start_time) + " seconds using " + str(workers) + " workers")
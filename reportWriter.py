@@ -0,0 +1,57 @@
+import csv, json
+
+
+# ReportWriter Class - streams the report of a benchmark run to disk as the mazes are walked
+# Instead of redirecting sys.stdout and printing a maze line by line, each maze's text report is joined into one
+# string and written with a single call to a large write buffer, and a compact machine-readable record of each maze
+# is written alongside it.
+# text_path - the file to write the text reports to, e.g. "mazes.txt"
+# records_path - the file to write one record per maze to, as CSV if it ends with ".csv" and as JSON Lines otherwise,
+#                or None to write no records
+# every - write the text report of every every-th maze only (maze 0, every, 2 * every, ...), or none if 0.
+#         Records are written for every maze
+# text - the open text report file, or None if no text reports are written
+class ReportWriter:
+    def __init__(self, text_path, records_path=None, every=1, buffer_size=1 << 20):
+        self.every = every
+        self.text = None
+        self.records = None
+        self.csv_writer = None
+        if every:
+            self.text = open(text_path, "w", buffering=buffer_size, encoding="utf-8")
+        if records_path is not None:
+            self.records = open(records_path, "w", buffering=buffer_size, encoding="utf-8", newline="")
+
+    # Return whether the text report of maze number maze_number should be written
+    def sampled(self, maze_number):
+        return self.text is not None and maze_number % self.every == 0
+
+    # Write the text report of one maze, given as a list of lines
+    def write_maze(self, lines):
+        if self.text is not None:
+            lines.append("")
+            self.text.write("\n".join(lines))
+
+    # Write the record of one maze, given as a dictionary with the same keys for every maze
+    def write_record(self, record):
+        if self.records is None:
+            return
+        if self.records.name.endswith(".csv"):
+            if self.csv_writer is None:
+                self.csv_writer = csv.DictWriter(self.records, fieldnames=list(record))
+                self.csv_writer.writeheader()
+            self.csv_writer.writerow(record)
+        else:
+            self.records.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def close(self):
+        if self.text is not None:
+            self.text.close()
+        if self.records is not None:
+            self.records.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
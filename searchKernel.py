@@ -0,0 +1,94 @@
+from heapq import heappop, heappush
+from typing import Dict, List, MutableSequence, Optional, Sequence, Tuple
+
+
+# Search kernel: the inner loop of a_star_search in main.py over the flat grid of a KnownMaze, without SearchNode
+# objects or method calls per node, written in plain annotated Python so that it can be compiled.
+# Build it in place, next to this file, with either of
+#     cythonize -i searchKernel.py
+#     mypyc searchKernel.py
+# Python then imports the compiled extension instead of this file, and falls back to this file if it is not built.
+
+
+# Perform A* search from the space at index root to the space at index target, using the walls in statuses, and
+# return (success, expanded). It expands exactly the same nodes in the same order as a_star_search with a
+# BinaryHeapQueue, and records the search tree in the same arrays of the SearchWorkspace.
+# table - the neighbor_table of the maze, or None to find the neighbors of each space with bounds checks instead
+# (see neighbor_indices in main.py)
+# statuses - the statuses of a KnownMaze, in which walls have status "0"
+# favor_high_g - break ties between nodes with the same cost + heuristic in favor of the higher cost if True,
+# of the lower cost if False, or first in first out if None
+# closed, generated, g, parents, search_id - the arrays of the SearchWorkspace and the id of this search
+# h_values - the heuristics learned by Adaptive A*, which are read and updated when the search succeeds,
+# or None to use the Manhattan distance
+def search(table: Optional[Sequence[int]], statuses: Dict[int, str], cols: int, root: int, target: int,
+           favor_high_g: Optional[bool], closed: MutableSequence[int], generated: MutableSequence[int],
+           g: MutableSequence[int], parents: MutableSequence[int], search_id: int,
+           h_values: Optional[MutableSequence[int]]) -> Tuple[bool, int]:
+    target_row = target // cols
+    target_col = target % cols
+    # The arrays of the workspace have one entry per space of the maze
+    size = len(closed)
+    # Heap entries are (cost + heuristic, tie-break on cost, insertion counter, index), the same order as
+    # BinaryHeapQueue, with the tie-break tie_sign * cost. The parent of each space is recorded when it is added to
+    # the heap with a lower cost, and the cost with which a space is expanded is the lowest, which is in g
+    tie_sign = 0
+    if favor_high_g is not None:
+        tie_sign = -1 if favor_high_g else 1
+    h = abs(root // cols - target_row) + abs(root % cols - target_col)
+    if h_values is not None and h_values[root] >= 0:
+        h = h_values[root]
+    heap: List[Tuple[int, int, int, int]] = [(h, 0, 0, root)]
+    counter = 0
+    generated[root] = search_id
+    g[root] = 0
+    parents[root] = -1
+    expanded = 0
+    # The index and cost of every expanded node, from which Adaptive A* learns its heuristics
+    expanded_indices: List[int] = []
+    expanded_costs: List[int] = []
+
+    while heap:
+        f, tie_break, order, index = heappop(heap)
+        if closed[index] == search_id:
+            continue
+        closed[index] = search_id
+        cost = g[index]
+        if h_values is not None:
+            expanded_indices.append(index)
+            expanded_costs.append(cost)
+        expanded += 1
+
+        if index == target:
+            if h_values is not None:
+                for i in range(len(expanded_indices)):
+                    h_values[expanded_indices[i]] = cost - expanded_costs[i]
+            return True, expanded
+
+        cost += 1
+        # The neighbors above, below, left and right, with -1 in place of any outside the maze
+        neighbors: Sequence[int]
+        if table is not None:
+            neighbors = table[4 * index:4 * index + 4]
+        else:
+            col = index % cols
+            neighbors = (index - cols if index >= cols else -1, index + cols if index + cols < size else -1,
+                         index - 1 if col != 0 else -1, index + 1 if col != cols - 1 else -1)
+        for neighbor in neighbors:
+            if neighbor == -1:
+                continue
+            if closed[neighbor] == search_id or (generated[neighbor] == search_id and g[neighbor] <= cost):
+                continue
+            if statuses.get(neighbor) != "0":
+                generated[neighbor] = search_id
+                g[neighbor] = cost
+                parents[neighbor] = index
+                h = -1
+                if h_values is not None:
+                    h = h_values[neighbor]
+                if h < 0:
+                    h = abs(neighbor // cols - target_row) + abs(neighbor % cols - target_col)
+                counter += 1
+                heappush(heap, (cost + h, tie_sign * cost, counter, neighbor))
+
+    return False, expanded